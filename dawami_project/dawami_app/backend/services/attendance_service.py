@@ -2,21 +2,15 @@ import sqlite3
 import os
 from datetime import datetime, date
 
-# Database path configuration
-DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
+# Database path configuration and connections are shared across services
+try:
+    from dawami_app.backend.services.db_connection import DB_FILE, get_db_connection
+except ModuleNotFoundError: # Module run directly as a script
+    from db_connection import DB_FILE, get_db_connection
 
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S" # For storing and parsing datetime
 DATE_FORMAT = "%Y-%m-%d" # For storing and parsing date
 
-def get_db_connection():
-    """Creates and returns a database connection."""
-    os.makedirs(DB_DIR, exist_ok=True)
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
-
 def clock_in(employee_id, clock_in_time_dt=None, notes=None, source='manual'):
     """
     Records a clock-in event for an employee.
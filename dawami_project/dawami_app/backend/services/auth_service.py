@@ -2,17 +2,11 @@ import hashlib
 import sqlite3
 import os
 
-# Database path configuration
-DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
-
-def get_db_connection():
-    """Creates and returns a database connection."""
-    os.makedirs(DB_DIR, exist_ok=True) # Ensure directory exists
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row # Access columns by name
-    return conn
+# Database path configuration and connections are shared across services
+try:
+    from dawami_app.backend.services.db_connection import DB_DIR, get_db_connection
+except ModuleNotFoundError: # Module run directly as a script
+    from db_connection import DB_DIR, get_db_connection
 
 def hash_password(password):
     """Hashes a plain password using SHA256."""
@@ -22,7 +16,7 @@ def verify_password(plain_password, hashed_password):
     """Verifies if the plain password matches the hashed one."""
     return hash_password(plain_password) == hashed_password
 
-def _ensure_roles_exist(conn):
+def _ensure_roles_exist(conn, commit=True):
     """Ensures default roles (Admin, Manager, Employee) exist."""
     cursor = conn.cursor()
     default_roles = [
@@ -34,13 +28,19 @@ def _ensure_roles_exist(conn):
         cursor.execute("SELECT id FROM Roles WHERE role_name = ?", (role_name,))
         if not cursor.fetchone():
             cursor.execute("INSERT INTO Roles (role_name, description) VALUES (?, ?)", (role_name, description))
-    conn.commit()
+    if commit:
+        conn.commit()
 
-def create_user(username, password, role_name, employee_id=None):
-    """Creates a new user in the database."""
-    conn = get_db_connection()
+def create_user(username, password, role_name, employee_id=None, conn=None):
+    """
+    Creates a new user in the database.
+    If `conn` is given, the caller owns the transaction: nothing is committed or closed here.
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        conn = get_db_connection()
     try:
-        _ensure_roles_exist(conn) # Ensure default roles are present
+        _ensure_roles_exist(conn, commit=owns_conn) # Ensure default roles are present
 
         cursor = conn.cursor()
         cursor.execute("SELECT id FROM Roles WHERE role_name = ?", (role_name,))
@@ -56,7 +56,8 @@ def create_user(username, password, role_name, employee_id=None):
             INSERT INTO Users (username, password_hash, role_id, employee_id, is_active)
             VALUES (?, ?, ?, ?, ?)
         """, (username, hashed_pass, role_id, employee_id, True))
-        conn.commit()
+        if owns_conn:
+            conn.commit()
         user_id = cursor.lastrowid
         print(f"User '{username}' created successfully with ID: {user_id}")
         return {'id': user_id, 'username': username, 'role_id': role_id, 'employee_id': employee_id}
@@ -67,35 +68,40 @@ def create_user(username, password, role_name, employee_id=None):
         print(f"Database error while creating user '{username}': {e}")
         return None
     finally:
-        if conn:
+        if owns_conn and conn:
             conn.close()
 
+def verify_user_credentials(username, password, user_row):
+    """
+    Checks a password against an already-fetched Users row.
+    Returns the user info dict on success, None otherwise.
+    """
+    if user_row:
+        if not user_row['is_active']:
+            print(f"User '{username}' is not active.")
+            return None
+
+        if verify_password(password, user_row['password_hash']):
+            print(f"User '{username}' authenticated successfully.")
+            return {
+                'user_id': user_row['id'], 
+                'username': user_row['username'], 
+                'role_id': user_row['role_id']
+            }
+        else:
+            print(f"Invalid password for user '{username}'.")
+            return None
+    else:
+        print(f"User '{username}' not found.")
+        return None
+
 def authenticate_user(username, password):
     """Authenticates a user by username and password."""
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
         cursor.execute("SELECT id, username, password_hash, role_id, is_active FROM Users WHERE username = ?", (username,))
-        user_row = cursor.fetchone()
-
-        if user_row:
-            if not user_row['is_active']:
-                print(f"User '{username}' is not active.")
-                return None
-            
-            if verify_password(password, user_row['password_hash']):
-                print(f"User '{username}' authenticated successfully.")
-                return {
-                    'user_id': user_row['id'], 
-                    'username': user_row['username'], 
-                    'role_id': user_row['role_id']
-                }
-            else:
-                print(f"Invalid password for user '{username}'.")
-                return None
-        else:
-            print(f"User '{username}' not found.")
-            return None
+        return verify_user_credentials(username, password, cursor.fetchone())
     except sqlite3.Error as e:
         print(f"Database error during authentication for user '{username}': {e}")
         return None
@@ -103,7 +109,39 @@ def authenticate_user(username, password):
         if conn:
             conn.close()
 
+def fetch_users_bulk(usernames):
+    """
+    Fetches several users in one query.
+    Returns a dict mapping username -> user row dict; unknown usernames are absent.
+    """
+    unique_usernames = list(dict.fromkeys(usernames)) # De-duplicate, keep order
+    if not unique_usernames:
+        return {}
+    placeholders = ", ".join("?" * len(unique_usernames))
+    sql = f"SELECT id, username, password_hash, role_id, is_active FROM Users WHERE username IN ({placeholders})"
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, unique_usernames)
+        return {row['username']: dict(row) for row in cursor.fetchall()}
+    except sqlite3.Error as e:
+        print(f"Database error fetching users {unique_usernames}: {e}")
+        return {}
+    finally:
+        if conn:
+            conn.close()
+
 # --- RBAC Placeholder Functions ---
+def _default_permissions_for_role(role_name):
+    """Hardcoded permissions used when RolePermissions has not been seeded."""
+    if role_name == 'Admin':
+        return ['manage_users', 'view_reports', 'submit_leave_request', 'approve_leave_request', 'manage_settings', 'record_attendance_manual']
+    elif role_name == 'Manager':
+        return ['view_reports', 'approve_leave_request', 'record_attendance_manual']
+    elif role_name == 'Employee':
+        return ['submit_leave_request', 'record_attendance_manual']
+    return []
+
 def get_user_permissions(user_id):
     """
     Placeholder for RBAC: Retrieves a list of permissions for a user.
@@ -138,12 +176,7 @@ def get_user_permissions(user_id):
         
         permissions = [row['permission_name'] for row in cursor.fetchall()]
         if not permissions: # Fallback to simple hardcoded if DB seeding isn't complete
-            if role_name == 'Admin':
-                return ['manage_users', 'view_reports', 'submit_leave_request', 'approve_leave_request', 'manage_settings', 'record_attendance_manual']
-            elif role_name == 'Manager':
-                return ['view_reports', 'approve_leave_request', 'record_attendance_manual']
-            elif role_name == 'Employee':
-                return ['submit_leave_request', 'record_attendance_manual']
+            return _default_permissions_for_role(role_name)
         return permissions
         
     except sqlite3.Error as e:
@@ -154,6 +187,35 @@ def get_user_permissions(user_id):
             conn.close()
 
 
+def get_login_bundle(user_id):
+    """
+    Retrieves a user's role name and permissions in a single query.
+    Returns {'role_name': ..., 'permissions': [...]} or None if the user/role is not found.
+    """
+    sql = """
+        SELECT r.role_name, GROUP_CONCAT(p.permission_name) AS perms
+        FROM Roles r
+        LEFT JOIN RolePermissions rp ON rp.role_id = r.id
+        LEFT JOIN Permissions p ON p.id = rp.permission_id
+        WHERE r.id = (SELECT role_id FROM Users WHERE id = ?)
+        GROUP BY r.id
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, (user_id,))
+        row = cursor.fetchone()
+        if not row:
+            return None
+        permissions = row['perms'].split(',') if row['perms'] else _default_permissions_for_role(row['role_name'])
+        return {'role_name': row['role_name'], 'permissions': permissions}
+    except sqlite3.Error as e:
+        print(f"Database error in get_login_bundle: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
 def user_has_permission(user_id, permission_name_to_check):
     """
     Placeholder for RBAC: Checks if a user has a specific permission.
@@ -0,0 +1,76 @@
+import sqlite3
+import os
+import threading
+
+# Database path configuration (shared by all services)
+DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "database")
+DB_NAME = "dawami_dev.db"
+DB_FILE = os.path.join(DB_DIR, DB_NAME)
+
+# Optional SQLite URI that replaces DB_FILE, e.g. "file:dawami_test?mode=memory&cache=shared" for
+# a throwaway in-memory test database. Read whenever a connection is opened, so a process can set
+# it before its first database call. An in-memory DB lives only as long as its last connection.
+DB_URL_ENV_VAR = "DAWAMI_DB_URL"
+
+# Applied to every new connection. WAL + synchronous=NORMAL syncs the log at
+# checkpoints instead of on every commit, which is what the many small writes
+# in seeding and the test scripts pay for under the default rollback journal.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+class _ReusableConnection(sqlite3.Connection):
+    """
+    Connection handed out by get_db_connection().
+    Services call close() when they are done; instead of closing, this rolls back any
+    transaction the caller left open, so the handle (and sqlite3's per-connection cache
+    of prepared statements) survives for the next call on the same thread.
+    """
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def dispose(self):
+        """Actually closes the underlying database handle."""
+        super().close()
+
+def get_db_url():
+    """Returns the URI from the DAWAMI_DB_URL environment variable, or None to use DB_FILE."""
+    return os.environ.get(DB_URL_ENV_VAR) or None
+
+_local = threading.local() # One cached connection per thread (sqlite3 objects are thread-bound)
+
+def create_db_connection(factory=sqlite3.Connection):
+    """Opens and returns a new, independent database connection."""
+    # Cached connections live for the whole process, so give the prepared-statement
+    # cache room for every service's statements (default is 128)
+    db_url = get_db_url()
+    if db_url:
+        conn = sqlite3.connect(db_url, uri=True, factory=factory, cached_statements=256)
+    else:
+        os.makedirs(DB_DIR, exist_ok=True) # Ensure directory exists
+        conn = sqlite3.connect(DB_FILE, factory=factory, cached_statements=256)
+    conn.row_factory = sqlite3.Row # Access columns by name
+    for pragma in CONNECTION_PRAGMAS: # journal_mode=WAL is a no-op (stays "memory") for in-memory DBs
+        conn.execute(pragma)
+    return conn
+
+def get_db_connection():
+    """
+    Returns this thread's long-lived database connection, opening it on first use.
+    Use create_db_connection() instead when the caller changes connection state
+    (e.g. isolation_level) or needs a transaction that spans other service calls.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = _local.conn = create_db_connection(factory=_ReusableConnection)
+    return conn
+
+def close_db_connection():
+    """Closes this thread's cached connection, if one is open."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.dispose()
+        _local.conn = None
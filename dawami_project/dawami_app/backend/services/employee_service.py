@@ -1,17 +1,11 @@
 import sqlite3
 import os
 
-# Database path configuration
-DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
-
-def get_db_connection():
-    """Creates and returns a database connection."""
-    os.makedirs(DB_DIR, exist_ok=True) # Ensure directory exists
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row # Access columns by name
-    return conn
+# Database path configuration and connections are shared across services
+try:
+    from dawami_app.backend.services.db_connection import DB_FILE, get_db_connection
+except ModuleNotFoundError: # Module run directly as a script
+    from db_connection import DB_FILE, get_db_connection
 
 def add_employee(first_name, last_name, employee_code, department, email, phone_number, job_title, work_schedule_id=None, profile_picture_path=None):
     """Adds a new employee to the Employees table."""
@@ -62,6 +56,26 @@ def get_employee(employee_id):
         if conn:
             conn.close()
 
+def get_employee_by_code(employee_code):
+    """Retrieves an employee by their unique employee_code."""
+    sql = "SELECT * FROM Employees WHERE employee_code = ? LIMIT 1" # employee_code is UNIQUE (indexed)
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, (employee_code,))
+        employee_row = cursor.fetchone()
+        if employee_row:
+            return dict(employee_row)
+        else:
+            print(f"Employee with code '{employee_code}' not found.")
+            return None
+    except sqlite3.Error as e:
+        print(f"Database error while fetching employee code '{employee_code}': {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
 def get_all_employees():
     """Retrieves all employees from the Employees table."""
     sql = "SELECT * FROM Employees ORDER BY last_name, first_name"
@@ -2,29 +2,30 @@ import sqlite3
 import os
 from datetime import datetime, date
 
-# Database path configuration
-DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
+# Database path configuration and connections are shared across services
+try:
+    from dawami_app.backend.services.db_connection import DB_FILE, get_db_connection
+except ModuleNotFoundError: # Module run directly as a script
+    from db_connection import DB_FILE, get_db_connection
 
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 DATE_FORMAT = "%Y-%m-%d"
 
-def get_db_connection():
-    """Creates and returns a database connection."""
-    os.makedirs(DB_DIR, exist_ok=True)
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Statements shared by several functions below. sqlite3 caches prepared statements per
+# connection keyed by SQL text, so one literal per statement keeps every caller on the same entry.
+_INSERT_LEAVE_TYPE_SQL = "INSERT INTO LeaveTypes (type_name, default_balance) VALUES (?, ?)"
+_SELECT_DEFAULT_BALANCE_SQL = "SELECT default_balance FROM LeaveTypes WHERE id = ?"
+_SELECT_BALANCE_SQL = "SELECT id, balance FROM LeaveBalances WHERE employee_id = ? AND leave_type_id = ? AND year = ?"
+_UPDATE_BALANCE_SQL = "UPDATE LeaveBalances SET balance = ? WHERE id = ?"
+_INSERT_BALANCE_SQL = "INSERT INTO LeaveBalances (employee_id, leave_type_id, year, balance) VALUES (?, ?, ?, ?)"
 
 # --- Leave Types ---
 def add_leave_type(type_name, default_balance=None):
     """Adds a new leave type."""
-    sql = "INSERT INTO LeaveTypes (type_name, default_balance) VALUES (?, ?)"
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(sql, (type_name, default_balance))
+        cursor.execute(_INSERT_LEAVE_TYPE_SQL, (type_name, default_balance))
         conn.commit()
         leave_type_id = cursor.lastrowid
         print(f"Leave type '{type_name}' added successfully with ID: {leave_type_id}.")
@@ -39,6 +40,37 @@ def add_leave_type(type_name, default_balance=None):
         if conn:
             conn.close()
 
+def add_leave_types_bulk(leave_types):
+    """
+    Adds several leave types in one transaction.
+    leave_types is a list of (type_name, default_balance) tuples. Returns the new IDs in the same
+    order, or None if any insert fails (e.g. a duplicate name), in which case nothing is added.
+    """
+    if not leave_types:
+        return []
+    type_names = [type_name for type_name, _ in leave_types]
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(_INSERT_LEAVE_TYPE_SQL, leave_types)
+        placeholders = ", ".join("?" * len(type_names))
+        cursor.execute(f"SELECT id, type_name FROM LeaveTypes WHERE type_name IN ({placeholders})", type_names)
+        ids_by_name = {row['type_name']: row['id'] for row in cursor.fetchall()}
+        conn.commit()
+        print(f"{len(leave_types)} leave types added successfully.")
+        return [ids_by_name[type_name] for type_name in type_names]
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        print(f"Error adding leave types {type_names}: {e}. Likely already exists.")
+        return None
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Database error adding leave types {type_names}: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
 def get_leave_types():
     """Retrieves all leave types."""
     sql = "SELECT * FROM LeaveTypes ORDER BY type_name"
@@ -58,17 +90,16 @@ def get_leave_types():
 # --- Leave Balances ---
 def get_leave_balance(employee_id, leave_type_id, year):
     """Retrieves the leave balance for a given employee, leave type, and year."""
-    sql = "SELECT balance FROM LeaveBalances WHERE employee_id = ? AND leave_type_id = ? AND year = ?"
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute(sql, (employee_id, leave_type_id, year))
+        cursor.execute(_SELECT_BALANCE_SQL, (employee_id, leave_type_id, year))
         row = cursor.fetchone()
         if row:
             return row['balance']
         else:
             # Check default balance from LeaveTypes
-            cursor.execute("SELECT default_balance FROM LeaveTypes WHERE id = ?", (leave_type_id,))
+            cursor.execute(_SELECT_DEFAULT_BALANCE_SQL, (leave_type_id,))
             lt_row = cursor.fetchone()
             if lt_row and lt_row['default_balance'] is not None:
                 # Create an initial balance record based on default for the year
@@ -95,8 +126,7 @@ def update_leave_balance(employee_id, leave_type_id, year, change_amount, is_ini
     try:
         cursor = conn.cursor()
         # Check if a record exists
-        cursor.execute("SELECT id, balance FROM LeaveBalances WHERE employee_id = ? AND leave_type_id = ? AND year = ?",
-                       (employee_id, leave_type_id, year))
+        cursor.execute(_SELECT_BALANCE_SQL, (employee_id, leave_type_id, year))
         existing_balance_row = cursor.fetchone()
 
         new_balance = 0.0
@@ -106,22 +136,20 @@ def update_leave_balance(employee_id, leave_type_id, year, change_amount, is_ini
             else:
                 new_balance = float(existing_balance_row['balance']) + float(change_amount)
             
-            sql_update = "UPDATE LeaveBalances SET balance = ? WHERE id = ?"
-            cursor.execute(sql_update, (new_balance, existing_balance_row['id']))
+            cursor.execute(_UPDATE_BALANCE_SQL, (new_balance, existing_balance_row['id']))
         else: # No existing record, create one
             if is_initial_balance:
                 new_balance = float(change_amount)
             else: # If not initial and no record, implies starting from 0 or default
                 # Get default from leave type if available
-                cursor.execute("SELECT default_balance FROM LeaveTypes WHERE id = ?", (leave_type_id,))
+                cursor.execute(_SELECT_DEFAULT_BALANCE_SQL, (leave_type_id,))
                 lt_row = cursor.fetchone()
                 base_balance = 0.0
                 if lt_row and lt_row['default_balance'] is not None:
                     base_balance = float(lt_row['default_balance'])
                 new_balance = base_balance + float(change_amount)
 
-            sql_insert = "INSERT INTO LeaveBalances (employee_id, leave_type_id, year, balance) VALUES (?, ?, ?, ?)"
-            cursor.execute(sql_insert, (employee_id, leave_type_id, year, new_balance))
+            cursor.execute(_INSERT_BALANCE_SQL, (employee_id, leave_type_id, year, new_balance))
         
         conn.commit()
         print(f"Leave balance updated for EmpID {employee_id}, LTID {leave_type_id}, Year {year}. New balance: {new_balance}")
@@ -134,6 +162,34 @@ def update_leave_balance(employee_id, leave_type_id, year, change_amount, is_ini
         if conn:
             conn.close()
 
+def update_leave_balances_bulk(balances):
+    """
+    Sets the balance for several (employee, leave type, year) combinations in one transaction,
+    like update_leave_balance(..., is_initial_balance=True) for each row.
+    balances is a list of (employee_id, leave_type_id, year, balance) tuples. Returns True on success.
+    """
+    if not balances:
+        return True
+    # UNIQUE (employee_id, leave_type_id, year) lets an upsert replace the existing-row check
+    sql = """
+        INSERT INTO LeaveBalances (employee_id, leave_type_id, year, balance) VALUES (?, ?, ?, ?)
+        ON CONFLICT (employee_id, leave_type_id, year) DO UPDATE SET balance = excluded.balance
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(sql, [(emp_id, lt_id, year, float(balance)) for emp_id, lt_id, year, balance in balances])
+        conn.commit()
+        print(f"Leave balances set for {len(balances)} employee/leave type/year combinations.")
+        return True
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Database error updating leave balances: {e}")
+        return False
+    finally:
+        if conn:
+            conn.close()
+
 # --- Leave Requests ---
 def apply_for_leave(employee_id, leave_type_id, start_date_str, end_date_str, reason):
     """Applies for leave for an employee."""
@@ -173,6 +229,53 @@ def apply_for_leave(employee_id, leave_type_id, start_date_str, end_date_str, re
         if conn:
             conn.close()
 
+def apply_for_leaves_bulk(leave_requests):
+    """
+    Applies for several leaves in one transaction.
+    leave_requests is a list of (employee_id, leave_type_id, start_date_str, end_date_str, reason) tuples.
+    Returns the new request IDs in the same order, or None if any row is invalid or fails to insert,
+    in which case nothing is added.
+    """
+    if not leave_requests:
+        return []
+    request_date_str = datetime.now().strftime(DATETIME_FORMAT)
+
+    # Validate date formats (basic)
+    try:
+        for _, _, start_date_str, end_date_str, _ in leave_requests:
+            datetime.strptime(start_date_str, DATE_FORMAT)
+            datetime.strptime(end_date_str, DATE_FORMAT)
+    except ValueError:
+        print("Error: Invalid date format. Use YYYY-MM-DD.")
+        return None
+
+    sql = """
+        INSERT INTO LeaveRequests (employee_id, leave_type_id, start_date, end_date, reason, status, request_date)
+        VALUES (?, ?, ?, ?, ?, 'Pending', ?)
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.executemany(sql, [tuple(row) + (request_date_str,) for row in leave_requests])
+        # Rows inserted by one statement inside one write transaction get consecutive
+        # AUTOINCREMENT ids, so the last one identifies them all.
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        conn.commit()
+        request_ids = list(range(last_id - len(leave_requests) + 1, last_id + 1))
+        print(f"{len(request_ids)} leave requests submitted successfully. Request IDs: {request_ids}")
+        return request_ids
+    except sqlite3.IntegrityError as e:
+        conn.rollback()
+        print(f"Error submitting leave requests (IntegrityError): {e}. Check Employee/LeaveType IDs.")
+        return None
+    except sqlite3.Error as e:
+        conn.rollback()
+        print(f"Database error submitting leave requests: {e}")
+        return None
+    finally:
+        if conn:
+            conn.close()
+
 def _update_leave_request_status(leave_request_id, new_status, approver_id):
     """Helper function to update leave request status and approver."""
     conn = get_db_connection()
@@ -256,6 +359,21 @@ def get_leave_requests(employee_id=None, status=None):
         if conn:
             conn.close()
 
+def get_leave_statuses(employee_id):
+    """Returns {leave_request_id: status} for an employee's leave requests."""
+    sql = "SELECT id, status FROM LeaveRequests WHERE employee_id = ?"
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(sql, (employee_id,))
+        return dict(cursor.fetchall()) # Two-column rows unpack straight into key/value pairs
+    except sqlite3.Error as e:
+        print(f"Database error fetching leave statuses for EmpID {employee_id}: {e}")
+        return {}
+    finally:
+        if conn:
+            conn.close()
+
 
 if __name__ == '__main__':
     print("Leave Service Module - Direct Execution (for testing)")
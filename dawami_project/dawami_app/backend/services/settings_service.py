@@ -2,21 +2,15 @@ import sqlite3
 import os
 from datetime import datetime
 
-# Database path configuration
-DB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
+# Database path configuration and connections are shared across services
+try:
+    from dawami_app.backend.services.db_connection import DB_FILE, get_db_connection
+except ModuleNotFoundError: # Module run directly as a script
+    from db_connection import DB_FILE, get_db_connection
 
 DATE_FORMAT = "%Y-%m-%d" # For holiday dates
 TIME_FORMAT = "%H:%M" # For work schedule times
 
-def get_db_connection():
-    """Creates and returns a database connection."""
-    os.makedirs(DB_DIR, exist_ok=True)
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
-
 # --- SystemSettings ---
 def get_setting(setting_key):
     """Retrieves a setting value by its key."""
@@ -265,33 +259,22 @@ def get_holidays(year=None):
 
 def delete_holiday(holiday_id_or_date_str):
     """Deletes a holiday by its ID or date string ('YYYY-MM-DD')."""
+    # A single statement matches either column; -1 never matches an AUTOINCREMENT id.
+    if isinstance(holiday_id_or_date_str, int) or holiday_id_or_date_str.isdigit():
+        holiday_id = int(holiday_id_or_date_str)
+    else:
+        holiday_id = -1
+    sql = "DELETE FROM Holidays WHERE id = ? OR date = ?"
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        deleted = False
-        # Try to delete by ID if it's an integer
-        if isinstance(holiday_id_or_date_str, int) or holiday_id_or_date_str.isdigit():
-            cursor.execute("DELETE FROM Holidays WHERE id = ?", (int(holiday_id_or_date_str),))
-            if cursor.rowcount > 0:
-                deleted = True
-                print(f"Holiday ID {holiday_id_or_date_str} deleted successfully.")
-        
-        # If not deleted by ID, try by date string
-        if not deleted:
-            try:
-                datetime.strptime(holiday_id_or_date_str, DATE_FORMAT) # Validate format
-                cursor.execute("DELETE FROM Holidays WHERE date = ?", (holiday_id_or_date_str,))
-                if cursor.rowcount > 0:
-                    deleted = True
-                    print(f"Holiday on date {holiday_id_or_date_str} deleted successfully.")
-            except ValueError: # Not a valid date string if we reach here after failing int conversion
-                pass
-
-        if not deleted:
+        cursor.execute(sql, (holiday_id, str(holiday_id_or_date_str)))
+        if cursor.rowcount == 0:
             print(f"No holiday found with ID or date '{holiday_id_or_date_str}' to delete.")
             return False
-            
+
         conn.commit()
+        print(f"Holiday '{holiday_id_or_date_str}' deleted successfully.")
         return True
     except sqlite3.Error as e:
         print(f"Database error deleting holiday '{holiday_id_or_date_str}': {e}")
@@ -1,6 +1,13 @@
+import glob
 import json
 import os
 
+try:
+    import orjson # Optional; a faster C parser that reads UTF-8 bytes directly
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 class LocalizationService:
     def __init__(self, language_code='ar', default_language='en'):
         # Determine the base path for i18n files relative to this file's location
@@ -9,29 +16,39 @@ class LocalizationService:
         self.language_code = language_code
         self.default_language = default_language
         self.translations = {}
+        self._cache = self._load_all_translations() # {language_code: translations}, read once
         self.load_translations(self.language_code)
 
+    def _load_all_translations(self):
+        """Reads and parses every i18n/*.json file once, keyed by language code (the file name)."""
+        catalogues = {}
+        for file_path in sorted(glob.glob(os.path.join(self.i18n_dir, '*.json'))):
+            language_code = os.path.splitext(os.path.basename(file_path))[0]
+            try:
+                with open(file_path, 'rb') as f:
+                    catalogues[language_code] = _json_loads(f.read()) # Both parsers accept UTF-8 bytes
+            except (OSError, ValueError): # Both parsers' decode errors subclass ValueError
+                print(f"Error: Could not decode JSON from translation file for language '{language_code}'.")
+                catalogues[language_code] = {} # Operate with empty translations on error
+        return catalogues
+
     def load_translations(self, language_code):
-        """Loads translations for the given language code."""
-        file_path = os.path.join(self.i18n_dir, f"{language_code}.json")
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.translations = json.load(f)
-            print(f"Successfully loaded translations for '{language_code}' from {file_path}")
-        except FileNotFoundError:
-            print(f"Warning: Translation file not found for language '{language_code}' at {file_path}.")
-            if language_code != self.default_language:
-                print(f"Falling back to default language '{self.default_language}'.")
-                self.load_translations(self.default_language) # Attempt to load default
-                # Set current lang to default if fallback occurs, to avoid repeated attempts for missing main lang
-                self.language_code = self.default_language 
-            else:
-                # If default language file is also missing, we operate with empty translations
-                print(f"Error: Default translation file '{self.default_language}.json' also not found.")
-                self.translations = {} 
-        except json.JSONDecodeError:
-            print(f"Error: Could not decode JSON from translation file for language '{language_code}'.")
-            self.translations = {} # Operate with empty translations on error
+        """Switches to the (already parsed) translations for the given language code."""
+        translations = self._cache.get(language_code)
+        if translations is not None:
+            self.translations = translations
+            print(f"Successfully loaded translations for '{language_code}'.")
+            return
+        print(f"Warning: Translation file not found for language '{language_code}' in {self.i18n_dir}.")
+        if language_code != self.default_language:
+            print(f"Falling back to default language '{self.default_language}'.")
+            self.load_translations(self.default_language) # Attempt to load default
+            # Set current lang to default if fallback occurs, to avoid repeated attempts for missing main lang
+            self.language_code = self.default_language
+        else:
+            # If default language file is also missing, we operate with empty translations
+            print(f"Error: Default translation file '{self.default_language}.json' also not found.")
+            self.translations = {}
 
     def get_string(self, key, default_value=None):
         """
@@ -52,7 +69,7 @@ class LocalizationService:
         return key
 
     def set_language(self, language_code):
-        """Sets the current language and reloads translations."""
+        """Sets the current language and switches to its cached translations."""
         print(f"Setting language to '{language_code}'")
         self.language_code = language_code
         self.load_translations(language_code)
@@ -14,9 +14,14 @@ class ThemeService:
 
     def __init__(self, default_theme='light'):
         self.default_theme = default_theme
-        self.current_theme = self._load_theme_from_settings() or default_theme
+        self.reload()
         print(f"ThemeService initialized. Current theme: '{self.current_theme}' (Loaded from settings if available, else default).")
 
+    def reload(self):
+        """Re-reads the persisted theme on this instance, as a new ThemeService would at startup."""
+        self.current_theme = self._load_theme_from_settings() or self.default_theme
+        return self.current_theme
+
     def _load_theme_from_settings(self):
         """Loads the theme preference from system settings."""
         persisted_theme = settings_service.get_setting(self.THEME_SETTING_KEY)
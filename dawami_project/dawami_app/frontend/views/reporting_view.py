@@ -1,6 +1,7 @@
 import os
 import sys
-from datetime import datetime, date # For testing date inputs
+import concurrent.futures
+from datetime import datetime, date, timedelta # For testing date inputs
 
 # Add project root to sys.path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -8,6 +9,12 @@ sys.path.append(PROJECT_ROOT)
 
 from dawami_app.backend.services import reporting_service
 
+# Row template for the daily attendance report, bound once at import time.
+_DAILY_ROW_DEFAULTS = {'notes': 'N/A', 'source': 'N/A'}
+_DAILY_FMT = ("  Emp: {employee_name} ({employee_code}), "
+              "In: {clock_in_time}, Out: {clock_out_time}, "
+              "Duration: {duration}, Notes: {notes}, Source: {source}\n").format_map
+
 # These functions simulate what would be called by actual UI event handlers.
 
 def handle_generate_daily_attendance_report_click(report_date_str):
@@ -20,17 +27,19 @@ def handle_generate_daily_attendance_report_click(report_date_str):
         return []
     
     report_data = reporting_service.get_daily_attendance_report(report_date_obj)
+    _show_daily_attendance_report(report_date_str, report_data)
+    return report_data
+
+def _show_daily_attendance_report(report_date_str, report_data):
+    """Prints a daily attendance report as returned by reporting_service."""
     if report_data:
         print(f"UI: Daily Attendance Report for {report_date_str} ({len(report_data)} entries):")
-        for row in report_data:
-            print(f"  Emp: {row['employee_name']} ({row['employee_code']}), "
-                  f"In: {row['clock_in_time']}, Out: {row['clock_out_time']}, "
-                  f"Duration: {row['duration']}, Notes: {row.get('notes', 'N/A')}, Source: {row.get('source', 'N/A')}")
+        buf = [_DAILY_FMT({**_DAILY_ROW_DEFAULTS, **row}) for row in report_data]
+        sys.stdout.write("".join(buf))
     elif report_data is not None: # Empty list
         print(f"UI: No attendance records found for {report_date_str}.")
     else: # None was returned
         print("UI: Error generating daily attendance report.")
-    return report_data
 
 def handle_generate_employee_summary_click(employee_id, start_date_str, end_date_str):
     """Simulates generating an employee attendance summary."""
@@ -44,6 +53,11 @@ def handle_generate_employee_summary_click(employee_id, start_date_str, end_date
         return None
         
     summary_data = reporting_service.get_employee_attendance_summary(employee_id, start_date_obj, end_date_obj)
+    _show_employee_summary(summary_data)
+    return summary_data
+
+def _show_employee_summary(summary_data):
+    """Prints an employee attendance summary as returned by reporting_service."""
     if summary_data:
         print("UI: Employee Attendance Summary:")
         print(f"  Employee ID: {summary_data['employee_id']}")
@@ -54,7 +68,6 @@ def handle_generate_employee_summary_click(employee_id, start_date_str, end_date
         print(f"  Early Departures: {summary_data['early_departures']}")
     else: # None or empty dict if error
         print("UI: Error generating employee attendance summary or no data.")
-    return summary_data
 
 def handle_generate_leave_report_click(start_date_str, end_date_str, employee_id=None, leave_type_id=None, status=None):
     """Simulates generating a leave report."""
@@ -69,6 +82,11 @@ def handle_generate_leave_report_click(start_date_str, end_date_str, employee_id
         return []
 
     report_data = reporting_service.get_leave_report(start_date_obj, end_date_obj, employee_id, leave_type_id, status)
+    _show_leave_report(report_data)
+    return report_data
+
+def _show_leave_report(report_data):
+    """Prints a leave report as returned by reporting_service."""
     if report_data:
         print(f"UI: Leave Report ({len(report_data)} entries):")
         for row in report_data:
@@ -79,7 +97,6 @@ def handle_generate_leave_report_click(start_date_str, end_date_str, employee_id
         print("UI: No leave records found matching criteria.")
     else: # None
         print("UI: Error generating leave report.")
-    return report_data
 
 def handle_generate_absentee_report_click(report_date_str):
     """Simulates generating an absentee report."""
@@ -91,6 +108,11 @@ def handle_generate_absentee_report_click(report_date_str):
         return []
         
     absentee_data = reporting_service.get_absentee_report(report_date_obj)
+    _show_absentee_report(report_date_str, absentee_data)
+    return absentee_data
+
+def _show_absentee_report(report_date_str, absentee_data):
+    """Prints an absentee report as returned by reporting_service."""
     if absentee_data:
         print(f"UI: Absentee Report for {report_date_str} ({len(absentee_data)} employees):")
         for emp in absentee_data:
@@ -99,7 +121,6 @@ def handle_generate_absentee_report_click(report_date_str):
         print(f"UI: No absentees found for {report_date_str} (all present or on approved leave).")
     else: # None
         print("UI: Error generating absentee report.")
-    return absentee_data
 
 
 if __name__ == '__main__':
@@ -112,19 +133,31 @@ if __name__ == '__main__':
 
     # Assuming employee ID 1 exists, and some data has been seeded by other module tests or seed_data.py
     TEST_EMP_ID = 1 
-    today_str = date.today().strftime(reporting_service.DATE_FORMAT)
-    seven_days_ago_str = (date.today() - timedelta(days=7)).strftime(reporting_service.DATE_FORMAT)
+    today = date.today()
+    seven_days_ago = today - timedelta(days=7)
+    today_str = today.strftime(reporting_service.DATE_FORMAT)
+    seven_days_ago_str = seven_days_ago.strftime(reporting_service.DATE_FORMAT)
 
-    # 1. Daily Attendance Report
-    handle_generate_daily_attendance_report_click(today_str)
-    
-    # 2. Employee Attendance Summary
-    handle_generate_employee_summary_click(TEST_EMP_ID, seven_days_ago_str, today_str)
+    # The four reports are independent read-only queries, so run them concurrently.
+    # Services cache one sqlite3 connection per thread, which keeps this thread-safe.
+    # Only the queries run on the pool; results are printed here, in order, so output doesn't interleave.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        daily_future = executor.submit(reporting_service.get_daily_attendance_report, today)
+        summary_future = executor.submit(reporting_service.get_employee_attendance_summary, TEST_EMP_ID, seven_days_ago, today)
+        leave_future = executor.submit(reporting_service.get_leave_report, seven_days_ago, today, status='Approved')
+        absentee_future = executor.submit(reporting_service.get_absentee_report, today)
 
-    # 3. Leave Report (e.g., all approved leaves in the last week)
-    handle_generate_leave_report_click(seven_days_ago_str, today_str, status='Approved')
-    
-    # 4. Absentee Report for today
-    handle_generate_absentee_report_click(today_str)
+        # 1. Daily Attendance Report
+        print(f"\n--- Daily Attendance Report (Date: {today_str}) ---")
+        _show_daily_attendance_report(today_str, daily_future.result())
+        # 2. Employee Attendance Summary
+        print(f"\n--- Employee Summary (EmpID: {TEST_EMP_ID}, {seven_days_ago_str} to {today_str}) ---")
+        _show_employee_summary(summary_future.result())
+        # 3. Leave Report (e.g., all approved leaves in the last week)
+        print(f"\n--- Leave Report (Approved, {seven_days_ago_str} to {today_str}) ---")
+        _show_leave_report(leave_future.result())
+        # 4. Absentee Report for today
+        print(f"\n--- Absentee Report (Date: {today_str}) ---")
+        _show_absentee_report(today_str, absentee_future.result())
 
     print("\nReporting View Module Demonstration Complete.")
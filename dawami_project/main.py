@@ -11,36 +11,27 @@ from dawami_app.backend.services import auth_service
 # --- Global state (simple version for now) ---
 current_logged_in_user = None
 
-def console_test_authentication(username, password):
+def console_test_authentication(username, password, user_row):
     global current_logged_in_user
     print(f"\nAttempting to authenticate user: {username}")
-    user_info = auth_service.authenticate_user(username, password)
+    user_info = auth_service.verify_user_credentials(username, password, user_row)
 
     if user_info:
         current_logged_in_user = user_info
         print(f"Authentication successful for {username}.")
         print(f"User Info: {user_info}")
 
-        role_name = "Unknown Role"
-        try:
-            conn = auth_service.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT role_name FROM Roles WHERE id = ?", (user_info['role_id'],))
-            role_row = cursor.fetchone()
-            if role_row:
-                role_name = role_row['role_name']
-            conn.close()
-        except Exception as e:
-            print(f"Error fetching role name: {e}")
+        # Role name and permissions come back from one JOIN query
+        login_bundle = auth_service.get_login_bundle(user_info['user_id'])
+        role_name = login_bundle['role_name'] if login_bundle else "Unknown Role"
+        permissions = login_bundle['permissions'] if login_bundle else []
         print(f"User Role: {role_name}")
-
-        permissions = auth_service.get_user_permissions(user_info['user_id'])
         print(f"Permissions for {username}: {permissions}")
 
         # Test specific permissions
         test_perms = ['manage_users', 'submit_leave_request', 'view_reports', 'approve_leave_request']
         for p_name in test_perms:
-            if auth_service.user_has_permission(user_info['user_id'], p_name):
+            if p_name in permissions:
                 print(f"  - Has permission: '{p_name}'")
             else:
                 print(f"  - Does NOT have permission: '{p_name}'")
@@ -76,11 +67,16 @@ if __name__ == "__main__":
             print(f"Error running setup/seed scripts: {e}. Please run them manually.")
             sys.exit(1)
             
-    # Test authentications
-    console_test_authentication("admin", "adminpassword")
-    console_test_authentication("manager1", "managerpassword")
-    console_test_authentication("employee1", "employeepassword")
-    console_test_authentication("admin", "wrongpassword")
-    console_test_authentication("nonexistentuser", "password")
+    # Test authentications (users are fetched in one query, passwords checked per case)
+    test_cases = [
+        ("admin", "adminpassword"),
+        ("manager1", "managerpassword"),
+        ("employee1", "employeepassword"),
+        ("admin", "wrongpassword"),
+        ("nonexistentuser", "password"),
+    ]
+    users = auth_service.fetch_users_bulk([username for username, _ in test_cases])
+    for username, password in test_cases:
+        console_test_authentication(username, password, users.get(username))
 
     print("\nDawami Application Console Test Completed.")
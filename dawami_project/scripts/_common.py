@@ -0,0 +1,72 @@
+import atexit
+import functools
+import importlib
+import os
+import sqlite3
+import subprocess
+import sys
+
+# Shared bootstrap for the scripts in this directory. Python caches this module,
+# so the path work below runs once no matter how many scripts import it.
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path: # Avoid stacking duplicate entries
+    sys.path.append(PROJECT_ROOT)
+
+from dawami_app.backend.services.db_connection import DB_FILE, get_db_connection, close_db_connection, get_db_url
+
+def get_conn():
+    """
+    Returns the shared connection used by the test helpers.
+    Opened on first call rather than at import, so importing a test script never
+    creates an empty DB file before its setup step has run.
+    """
+    return get_db_connection()
+
+# Checked once, when the first script imports this module. That is also before any
+# service has opened (and thereby created) the file, e.g. via dawami_app.core at import.
+if get_db_url():
+    # DAWAMI_DB_URL (e.g. an in-memory DB): open the shared connection now, which also keeps an
+    # in-memory DB alive between the setup scripts' own connections, and check for tables instead
+    DB_EXISTS = get_conn().execute("SELECT 1 FROM sqlite_master WHERE type='table' LIMIT 1").fetchone() is not None
+else:
+    DB_EXISTS = os.path.exists(DB_FILE)
+
+@functools.lru_cache(maxsize=None)
+def python_interpreter():
+    """Interpreter for running helper scripts: the project's venv python if present, else this one. Looked up once."""
+    venv_python = os.path.join(PROJECT_ROOT, "venv", "bin", "python")
+    return venv_python if os.path.exists(venv_python) else sys.executable
+
+def run_setup_scripts(*names):
+    """
+    Runs the named setup scripts (e.g. "database_setup", "seed_data") in order, calling each
+    module's main() in this process. Only if a script can't be imported is it spawned with
+    python_interpreter() instead, as the test scripts used to do for every run.
+    """
+    for name in names:
+        try:
+            module = importlib.import_module(f"scripts.{name}")
+        except ImportError as e:
+            print(f"Could not import {name} ({e}); running it with {python_interpreter()}.")
+            subprocess.run([python_interpreter(), os.path.join(PROJECT_ROOT, "scripts", f"{name}.py")], check=True, cwd=PROJECT_ROOT)
+        else:
+            module.main()
+
+def apply_test_pragmas():
+    """
+    Tunes the shared connection for a test run. With DAWAMI_TEST_FAST set (e.g. in CI), durability
+    is dropped too: nothing is fsynced, since the test data is cleared and re-seeded on every run anyway.
+    """
+    conn = get_conn()
+    try:
+        conn.execute("PRAGMA cache_size=-65536") # 64 MiB page cache for this connection
+        if os.getenv("DAWAMI_TEST_FAST"):
+            # journal_mode is left at WAL: it is stored in the DB file, so switching it here would
+            # outlive the run (and fails with "database is locked" while another connection is open)
+            conn.execute("PRAGMA synchronous=OFF")
+            print("DAWAMI_TEST_FAST set: running without fsyncs.")
+    except sqlite3.Error as e:
+        print(f"Warning: could not apply test pragmas: {e}")
+
+# The shared connection stays open for the whole run; really close it on exit
+atexit.register(close_db_connection)
@@ -1,16 +1,18 @@
 import sqlite3
 import os
+import sys
 
 DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "dawami_app", "database")
 DB_NAME = "dawami_dev.db"
 DB_FILE = os.path.join(DB_DIR, DB_NAME)
 
-def create_connection(db_file_path):
-    """Create a database connection to a SQLite database."""
+def create_connection(db_file_path, uri=False):
+    """Create a database connection to a SQLite database (db_file_path is an SQLite URI if uri is True)."""
     conn = None
     try:
-        os.makedirs(os.path.dirname(db_file_path), exist_ok=True)
-        conn = sqlite3.connect(db_file_path)
+        if not uri:
+            os.makedirs(os.path.dirname(db_file_path), exist_ok=True)
+        conn = sqlite3.connect(db_file_path, uri=uri)
         print(f"SQLite version: {sqlite3.sqlite_version}")
         print(f"Successfully connected to database at {db_file_path}")
     except sqlite3.Error as e:
@@ -192,6 +194,16 @@ def create_tables(conn):
         """)
         print("Table 'Holidays' created successfully or already exists.")
 
+        # Covering index for per-employee date-range reports (e.g. attendance summary).
+        # Carries the filter (employee_id, attendance_date) and the projected times so
+        # SQLite can answer the range from the index alone. Trade-off: every clock-in/out
+        # also updates this index, adding a little write cost to AttendanceLog.
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_attlog_emp_daterange
+            ON AttendanceLog (employee_id, attendance_date, clock_in_time, clock_out_time);
+        """)
+        print("Index 'idx_attlog_emp_daterange' created successfully or already exists.")
+
         conn.commit()
         print("All tables created successfully and changes committed.")
 
@@ -202,7 +214,18 @@ def create_tables(conn):
             print("Changes rolled back.")
 
 
-if __name__ == "__main__":
+def main():
+    """Creates the database directory, connects, and creates all tables."""
+    db_url = os.environ.get("DAWAMI_DB_URL") # Same override the services' db_connection honours
+    if db_url:
+        conn = create_connection(db_url, uri=True)
+        if conn is not None:
+            create_tables(conn)
+            conn.close()
+        else:
+            print("Error! Cannot create the database connection.")
+        return
+
     # Ensure the database directory exists
     if not os.path.exists(DB_DIR):
         try:
@@ -210,7 +233,7 @@ if __name__ == "__main__":
             print(f"Database directory created at {DB_DIR}")
         except OSError as e:
             print(f"Error creating database directory {DB_DIR}: {e}")
-            exit(1) # Exit if directory creation fails
+            sys.exit(1) # Exit if directory creation fails
 
     conn = create_connection(DB_FILE)
 
@@ -220,3 +243,7 @@ if __name__ == "__main__":
         print("Database connection closed.")
     else:
         print("Error! Cannot create the database connection.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import concurrent.futures
+import contextlib
+import importlib
+import multiprocessing
+import os
+import sys
+import time
+
+# Test scripts whose main_test_flow() can run side by side. Each one gets its own in-memory
+# database (see DAWAMI_DB_URL in db_connection.py), so they never contend for dawami_dev.db.
+PARALLEL_TEST_MODULES = (
+    "test_reporting_module",
+    "test_settings_module",
+)
+
+def run_test_module(module_name):
+    """Runs one test script's main_test_flow() in this (fresh worker) process. Returns the elapsed seconds."""
+    # Set before the test module (and through it _common and the services) is imported
+    os.environ["DAWAMI_DB_URL"] = f"file:{module_name}?mode=memory&cache=shared"
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(f"scripts.{module_name}")
+    except ModuleNotFoundError: # Runner started directly (python scripts/...), not with -m from the project root
+        module = importlib.import_module(module_name)
+    module.main_test_flow()
+    return time.perf_counter() - start
+
+def main():
+    print(f"Running {len(PARALLEL_TEST_MODULES)} test modules in parallel (console output may interleave)...")
+    failures = []
+    # A fresh spawned process per module: _common, DB_EXISTS and the cached connection are bound
+    # to the DAWAMI_DB_URL of the first module a process imports, so a pool worker reused for a
+    # second module would run it against the first one's database. (A shared pool with
+    # max_tasks_per_child=1 would do the same, but that needs Python 3.11+.)
+    spawn = multiprocessing.get_context("spawn")
+    with contextlib.ExitStack() as stack:
+        futures = {}
+        for name in PARALLEL_TEST_MODULES:
+            executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=spawn))
+            futures[executor.submit(run_test_module, name)] = name
+        for future in concurrent.futures.as_completed(futures):
+            name = futures[future]
+            try:
+                elapsed = future.result()
+                print(f"[PASS] {name} ({elapsed:.2f}s)")
+            except BaseException as e: # AssertionError, sys.exit() from a setup step, ...
+                print(f"[FAIL] {name}: {type(e).__name__}: {e}")
+                failures.append(name)
+
+    if failures:
+        print(f"\n{len(failures)} of {len(PARALLEL_TEST_MODULES)} test modules failed: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\nAll {len(PARALLEL_TEST_MODULES)} test modules passed.")
+
+if __name__ == "__main__":
+    main()
@@ -7,22 +7,41 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(PROJECT_ROOT)
 
 from dawami_app.backend.services import auth_service
-
-DB_DIR = os.path.join(PROJECT_ROOT, "dawami_app", "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
-
-def get_db_connection():
-    """Creates and returns a database connection."""
-    os.makedirs(DB_DIR, exist_ok=True)
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+from dawami_app.backend.services.db_connection import DB_FILE, create_db_connection, get_db_url
+
+def _seed_named_rows(cursor, table, name_column, rows):
+    """
+    Inserts (name, description) rows with INSERT OR IGNORE and returns {name: id} for every row.
+    On SQLite 3.35+ a single multi-VALUES INSERT ... RETURNING hands back the new IDs directly;
+    only names that already existed (re-seed) need a follow-up SELECT.
+    """
+    if sqlite3.sqlite_version_info >= (3, 35, 0):
+        values_sql = ", ".join(["(?, ?)"] * len(rows))
+        flat_params = [value for row in rows for value in row]
+        cursor.execute(f"INSERT OR IGNORE INTO {table} ({name_column}, description) VALUES {values_sql} "
+                       f"RETURNING id, {name_column}", flat_params)
+        ids = {row[name_column]: row['id'] for row in cursor.fetchall()}
+        created_count = len(ids)
+    else: # RETURNING unsupported; fall back to executemany + SELECT
+        cursor.executemany(f"INSERT OR IGNORE INTO {table} ({name_column}, description) VALUES (?, ?)", rows)
+        ids = {}
+        created_count = cursor.rowcount
+    print(f"{table} seeded: {created_count} created, {len(rows) - created_count} already existed.")
+
+    missing_names = [name for name, _ in rows if name not in ids]
+    if missing_names:
+        placeholders = ", ".join("?" * len(missing_names))
+        cursor.execute(f"SELECT id, {name_column} FROM {table} WHERE {name_column} IN ({placeholders})", missing_names)
+        ids.update({row[name_column]: row['id'] for row in cursor.fetchall()})
+    return ids
 
 def seed_roles_and_permissions():
-    conn = get_db_connection()
+    conn = create_db_connection() # Dedicated connection: isolation_level is changed below
+    conn.isolation_level = None # Manage the transaction explicitly below
     try:
         cursor = conn.cursor()
+        # One write transaction for the whole seed: a single journal sync instead of one per statement
+        cursor.execute("BEGIN IMMEDIATE")
 
         # --- Seed Roles (Idempotent) ---
         roles = [
@@ -30,17 +49,8 @@ def seed_roles_and_permissions():
             ('Manager', 'Manager with supervisory privileges.'),
             ('Employee', 'Regular employee with standard access.')
         ]
-        role_ids = {}
-        for name, desc in roles:
-            cursor.execute("SELECT id FROM Roles WHERE role_name = ?", (name,))
-            role_row = cursor.fetchone()
-            if role_row:
-                role_ids[name] = role_row['id']
-                print(f"Role '{name}' already exists with ID: {role_ids[name]}.")
-            else:
-                cursor.execute("INSERT INTO Roles (role_name, description) VALUES (?, ?)", (name, desc))
-                role_ids[name] = cursor.lastrowid
-                print(f"Role '{name}' created with ID: {role_ids[name]}.")
+        # UNIQUE(role_name) makes INSERT OR IGNORE idempotent
+        role_ids = _seed_named_rows(cursor, "Roles", "role_name", roles)
 
         # --- Seed Permissions (Idempotent) ---
         permissions = [
@@ -55,17 +65,7 @@ def seed_roles_and_permissions():
             # 'edit_own_profile', 'manage_employee_profiles',
             # 'manage_schedules', 'manage_leave_types'
         ]
-        permission_ids = {}
-        for name, desc in permissions:
-            cursor.execute("SELECT id FROM Permissions WHERE permission_name = ?", (name,))
-            perm_row = cursor.fetchone()
-            if perm_row:
-                permission_ids[name] = perm_row['id']
-                print(f"Permission '{name}' already exists with ID: {permission_ids[name]}.")
-            else:
-                cursor.execute("INSERT INTO Permissions (permission_name, description) VALUES (?, ?)", (name, desc))
-                permission_ids[name] = cursor.lastrowid
-                print(f"Permission '{name}' created with ID: {permission_ids[name]}.")
+        permission_ids = _seed_named_rows(cursor, "Permissions", "permission_name", permissions)
 
         # --- Seed RolePermissions (Idempotent) ---
         # Define which permissions each role gets
@@ -75,50 +75,47 @@ def seed_roles_and_permissions():
             'Employee': ['submit_leave_request', 'record_attendance_manual']
         }
 
-        for role_name, perm_names in role_permission_map.items():
-            current_role_id = role_ids.get(role_name)
-            if not current_role_id:
-                print(f"Warning: Role ID for '{role_name}' not found. Skipping permissions.")
-                continue
-            for perm_name in perm_names:
-                current_perm_id = permission_ids.get(perm_name)
-                if not current_perm_id:
-                    print(f"Warning: Permission ID for '{perm_name}' not found. Skipping for role '{role_name}'.")
-                    continue
-                
-                cursor.execute("SELECT role_id FROM RolePermissions WHERE role_id = ? AND permission_id = ?", (current_role_id, current_perm_id))
-                if cursor.fetchone():
-                    print(f"Permission '{perm_name}' already assigned to role '{role_name}'.")
-                else:
-                    cursor.execute("INSERT INTO RolePermissions (role_id, permission_id) VALUES (?, ?)", (current_role_id, current_perm_id))
-                    print(f"Assigned permission '{perm_name}' to role '{role_name}'.")
+        # PRIMARY KEY (role_id, permission_id) makes INSERT OR IGNORE idempotent
+        pairs = [
+            (role_ids[role_name], permission_ids[perm_name])
+            for role_name, perm_names in role_permission_map.items()
+            for perm_name in perm_names
+            if role_name in role_ids and perm_name in permission_ids
+        ]
+        cursor.executemany("INSERT OR IGNORE INTO RolePermissions (role_id, permission_id) VALUES (?, ?)", pairs)
+        print(f"RolePermissions seeded: {cursor.rowcount} assigned, {len(pairs) - cursor.rowcount} already assigned.")
         
-        conn.commit()
+        cursor.execute("COMMIT")
         print("Roles, Permissions, and RolePermissions seeded successfully.")
 
     except sqlite3.Error as e:
         print(f"Database error during seeding: {e}")
-        if conn:
-            conn.rollback()
+        if conn and conn.in_transaction:
+            conn.execute("ROLLBACK")
     finally:
         if conn:
             conn.close()
 
 def seed_users():
-    # --- Create Default Admin User ---
-    # `create_user` already ensures roles exist.
-    admin_user = auth_service.create_user("admin", "adminpassword", "Admin")
-    if admin_user:
-        print(f"Admin user '{admin_user['username']}' created/verified.")
-    else:
-        print("Failed to create admin user or user already exists with a different configuration.")
-
-    # --- Create Sample Employee and Employee User ---
-    # For employee user, we might need a placeholder employee record first.
-    # Let's insert a minimal one if it doesn't exist.
-    conn = get_db_connection()
+    # All users and the placeholder employee are written in one transaction;
+    # `create_user` joins it via the shared connection instead of committing itself.
+    conn = create_db_connection() # Dedicated connection: isolation_level is changed below
+    conn.isolation_level = None # Manage the transaction explicitly below
     try:
         cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # --- Create Default Admin User ---
+        # `create_user` already ensures roles exist.
+        admin_user = auth_service.create_user("admin", "adminpassword", "Admin", conn=conn)
+        if admin_user:
+            print(f"Admin user '{admin_user['username']}' created/verified.")
+        else:
+            print("Failed to create admin user or user already exists with a different configuration.")
+
+        # --- Create Sample Employee and Employee User ---
+        # For employee user, we might need a placeholder employee record first.
+        # Let's insert a minimal one if it doesn't exist.
         sample_employee_code = "EMP000"
         cursor.execute("SELECT id FROM Employees WHERE employee_code = ?", (sample_employee_code,))
         emp_row = cursor.fetchone()
@@ -133,11 +130,10 @@ def seed_users():
                 VALUES (?, ?, ?, ?, ?, ?)
             """, ("Sample", "Employee", sample_employee_code, "employee1@example.com", "General", "Staff"))
             employee_id_for_user = cursor.lastrowid
-            conn.commit()
             print(f"Created placeholder employee '{sample_employee_code}' with ID: {employee_id_for_user}.")
         
         if employee_id_for_user:
-            emp_user = auth_service.create_user("employee1", "employeepassword", "Employee", employee_id=employee_id_for_user)
+            emp_user = auth_service.create_user("employee1", "employeepassword", "Employee", employee_id=employee_id_for_user, conn=conn)
             if emp_user:
                 print(f"Employee user '{emp_user['username']}' created/verified for employee ID {employee_id_for_user}.")
             else:
@@ -145,27 +141,34 @@ def seed_users():
         else:
             print("Could not obtain an employee_id for creating a sample employee user.")
 
+        # Create a manager user (without employee_id for now, or create another sample employee)
+        manager_user = auth_service.create_user("manager1", "managerpassword", "Manager", conn=conn)
+        if manager_user:
+            print(f"Manager user '{manager_user['username']}' created/verified.")
+        else:
+            print("Failed to create manager user or user already exists.")
+
+        cursor.execute("COMMIT")
+
     except sqlite3.Error as e:
-        print(f"Database error during user seeding (employee part): {e}")
+        print(f"Database error during user seeding: {e}")
+        if conn and conn.in_transaction:
+            conn.execute("ROLLBACK")
     finally:
         if conn:
             conn.close()
-    
-    # Create a manager user (without employee_id for now, or create another sample employee)
-    manager_user = auth_service.create_user("manager1", "managerpassword", "Manager")
-    if manager_user:
-        print(f"Manager user '{manager_user['username']}' created/verified.")
-    else:
-        print("Failed to create manager user or user already exists.")
 
 
-if __name__ == "__main__":
+def main():
+    """Seeds roles, permissions, and default users into an existing database."""
     print("Starting database seeding process...")
     # 1. Ensure the database and tables are created by running database_setup.py first
     #    (This script assumes tables already exist)
     
     # Check if DB file exists, if not, prompt to run database_setup.py
-    if not os.path.exists(DB_FILE):
+    if get_db_url():
+        print(f"Using database at DAWAMI_DB_URL={get_db_url()}.")
+    elif not os.path.exists(DB_FILE):
         print(f"Database file not found at {DB_FILE}.")
         print("Please run 'python scripts/database_setup.py' first to create the database and tables.")
         # Optionally, you could try to run it from here:
@@ -187,3 +190,7 @@ if __name__ == "__main__":
     seed_roles_and_permissions()
     seed_users()
     print("Database seeding process completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,14 @@
-import os
 import sys
 import sqlite3
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta
 
-# Add project root to sys.path
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(PROJECT_ROOT)
+try:
+    from scripts._common import DB_FILE, get_conn, DB_EXISTS, run_setup_scripts # Also puts the project root on sys.path
+except ModuleNotFoundError: # Script run directly (python scripts/...), not with -m from the project root
+    from _common import DB_FILE, get_conn, DB_EXISTS, run_setup_scripts
 
-from dawami_app.backend.services import attendance_service
-from dawami_app.backend.services import employee_service # To add test employees
-from dawami_app.frontend.views import attendance_view # Placeholder UI handlers
-
-DB_DIR = os.path.join(PROJECT_ROOT, "dawami_app", "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
+# Service and view modules are imported inside the functions that use them, so
+# importing this module (e.g. for test discovery) doesn't load the app stack.
 
 # Test employee details
 EMP_TEST_ID_1 = None
@@ -25,61 +20,51 @@ EMP_TEST_CODE_2 = "ATT_EMP002"
 def clear_attendance_table():
     """Utility function to clear the AttendanceLog table for a clean test run."""
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM AttendanceLog")
-        conn.commit()
+        conn = get_conn()
+        with conn: # Commits on success, rolls back on error
+            conn.execute("DELETE FROM AttendanceLog")
         print("AttendanceLog table cleared for testing.")
     except sqlite3.Error as e:
         print(f"Error clearing AttendanceLog table: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def setup_test_employees():
     """Ensures test employees exist, creating them if necessary."""
     global EMP_TEST_ID_1, EMP_TEST_ID_2
-    
-    emp1 = employee_service.add_employee("AttTest", "UserOne", EMP_TEST_CODE_1, "Testing", "att001@example.com", "777-001", "Tester")
-    if emp1:
-        EMP_TEST_ID_1 = emp1['id']
-    else: # Try to fetch if already exists
-        emps = employee_service.get_all_employees()
-        for e in emps:
-            if e['employee_code'] == EMP_TEST_CODE_1:
-                EMP_TEST_ID_1 = e['id']
-                break
-        if not EMP_TEST_ID_1:
-             print(f"CRITICAL: Could not create or find employee {EMP_TEST_CODE_1}")
-             sys.exit(1)
-
-
-    emp2 = employee_service.add_employee("AttTest", "UserTwo", EMP_TEST_CODE_2, "Testing", "att002@example.com", "777-002", "Tester")
-    if emp2:
-        EMP_TEST_ID_2 = emp2['id']
-    else: # Try to fetch if already exists
-        emps = employee_service.get_all_employees()
-        for e in emps:
-            if e['employee_code'] == EMP_TEST_CODE_2:
-                EMP_TEST_ID_2 = e['id']
-                break
-        if not EMP_TEST_ID_2:
-            print(f"CRITICAL: Could not create or find employee {EMP_TEST_CODE_2}")
+    from dawami_app.backend.services import employee_service # To add test employees
+
+    test_employees = {
+        EMP_TEST_CODE_1: ("AttTest", "UserOne", EMP_TEST_CODE_1, "Testing", "att001@example.com", "777-001", "Tester"),
+        EMP_TEST_CODE_2: ("AttTest", "UserTwo", EMP_TEST_CODE_2, "Testing", "att002@example.com", "777-002", "Tester"),
+    }
+    # One indexed lookup for both codes; add_employee is only attempted for codes not yet present
+    try:
+        rows = get_conn().execute("SELECT id, employee_code FROM Employees WHERE employee_code IN (?, ?)",
+                                  (EMP_TEST_CODE_1, EMP_TEST_CODE_2)).fetchall()
+        existing = {row['employee_code']: row['id'] for row in rows}
+    except sqlite3.Error as e:
+        print(f"Error looking up test employees: {e}")
+        existing = {}
+
+    for code, details in test_employees.items():
+        if code not in existing:
+            emp = employee_service.add_employee(*details)
+            if emp:
+                existing[code] = emp['id']
+        if code not in existing:
+            print(f"CRITICAL: Could not create or find employee {code}")
             sys.exit(1)
-            
+
+    EMP_TEST_ID_1 = existing[EMP_TEST_CODE_1]
+    EMP_TEST_ID_2 = existing[EMP_TEST_CODE_2]
     print(f"Test employees ensured: ID1={EMP_TEST_ID_1} ({EMP_TEST_CODE_1}), ID2={EMP_TEST_ID_2} ({EMP_TEST_CODE_2})")
 
 
 def setup_database():
     """Ensures the database and tables exist. Runs setup scripts if DB not found."""
-    if not os.path.exists(DB_FILE):
+    if not DB_EXISTS:
         print(f"Database not found at {DB_FILE}. Running setup scripts...")
         try:
-            import subprocess
-            venv_python = next((p for p in [os.path.join(PROJECT_ROOT, "venv", "bin", "python"), sys.executable] if os.path.exists(p)), sys.executable)
-            print(f"Using Python interpreter: {venv_python} for setup.")
-            subprocess.run([venv_python, os.path.join(PROJECT_ROOT, "scripts", "database_setup.py")], check=True, cwd=PROJECT_ROOT)
-            subprocess.run([venv_python, os.path.join(PROJECT_ROOT, "scripts", "seed_data.py")], check=True, cwd=PROJECT_ROOT) # Ensures roles etc. exist too
+            run_setup_scripts("database_setup", "seed_data") # seed_data ensures roles etc. exist too
             print("Database setup and seeding scripts executed.")
         except Exception as e:
             print(f"Error running setup/seed scripts: {e}. Please ensure they are runnable.")
@@ -89,17 +74,28 @@ def setup_database():
 
 
 def main_test_flow():
+    from dawami_app.backend.services import attendance_service
+    from dawami_app.frontend.views import attendance_view # Placeholder UI handlers
+
     print("--- Starting Attendance Module Test ---")
     setup_database()
     setup_test_employees() # Ensure our test employees are in place
     clear_attendance_table() # Start with clean attendance data
 
+    # Capture the clock once; every timestamp and date below derives from it, so the
+    # test can't straddle midnight between two datetime.now() calls.
+    now = datetime.now()
+    today_date = now.date()
+    yesterday_date = (now - timedelta(days=1)).date()
+    # Date strings are built with date.isoformat(), which matches the service's ISO DATE_FORMAT
+    assert attendance_service.DATE_FORMAT == "%Y-%m-%d"
+    today_str, yesterday_str = today_date.isoformat(), yesterday_date.isoformat()
+
     # --- Test attendance_service.py directly ---
     print("\n*** Testing attendance_service.py directly ***")
 
     # 1. Clock In Employee 1
     print("\n1. Clocking In (Service):")
-    now = datetime.now()
     clock_in_time_emp1 = now - timedelta(hours=1) # An hour ago
     log_id_emp1 = attendance_service.clock_in(EMP_TEST_ID_1, clock_in_time_dt=clock_in_time_emp1, notes="Service Clock In EMP1")
     assert log_id_emp1 is not None
@@ -135,7 +131,6 @@ def main_test_flow():
     # 7. Get Attendance Records
     print("\n5. Getting Attendance Records (Service):")
     # Records for EMP_TEST_ID_1 today
-    today_date = date.today()
     records_emp1_today = attendance_service.get_attendance_records(employee_id=EMP_TEST_ID_1, start_date_obj=today_date, end_date_obj=today_date)
     assert len(records_emp1_today) == 1
     assert records_emp1_today[0]['id'] == log_id_emp1
@@ -179,12 +174,10 @@ def main_test_flow():
     attendance_view.handle_get_current_status_click(EMP_TEST_ID_1)
 
     # 5. View Attendance via UI Handler (today)
-    today_str_for_ui = datetime.now().strftime(attendance_service.DATE_FORMAT)
-    attendance_view.handle_view_attendance_click(employee_id=EMP_TEST_ID_1, start_date_str=today_str_for_ui, end_date_str=today_str_for_ui)
+    attendance_view.handle_view_attendance_click(employee_id=EMP_TEST_ID_1, start_date_str=today_str, end_date_str=today_str)
     
     # 6. View all attendance for yesterday (should be none or from other tests if DB wasn't fully cleared)
-    yesterday_str_for_ui = (datetime.now() - timedelta(days=1)).strftime(attendance_service.DATE_FORMAT)
-    attendance_view.handle_view_attendance_click(start_date_str=yesterday_str_for_ui, end_date_str=yesterday_str_for_ui)
+    attendance_view.handle_view_attendance_click(start_date_str=yesterday_str, end_date_str=yesterday_str)
 
 
     print("\n*** Placeholder UI function tests completed. ***")
@@ -1,50 +1,34 @@
-import os
 import sys
 import sqlite3
 
-# Add project root to sys.path to allow importing services and views
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(PROJECT_ROOT)
+try:
+    from scripts._common import DB_FILE, get_conn, DB_EXISTS, run_setup_scripts # Also puts the project root on sys.path
+except ModuleNotFoundError: # Script run directly (python scripts/...), not with -m from the project root
+    from _common import DB_FILE, get_conn, DB_EXISTS, run_setup_scripts
 
 from dawami_app.backend.services import employee_service
 from dawami_app.frontend.views import employee_view # Placeholder UI handlers
 
-DB_DIR = os.path.join(PROJECT_ROOT, "dawami_app", "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
+_DEL_EMP = "DELETE FROM Employees"
 
 def clear_employees_table():
     """Utility function to clear the Employees table for a clean test run."""
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM Employees")
-        conn.commit()
+        conn = get_conn()
+        with conn: # Commits on success, rolls back on error
+            conn.execute(_DEL_EMP)
         print("Employees table cleared for testing.")
     except sqlite3.Error as e:
         print(f"Error clearing Employees table: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def setup_database():
     """Ensures the database and tables exist. Runs setup scripts if DB not found."""
-    if not os.path.exists(DB_FILE):
+    if not DB_EXISTS:
         print(f"Database not found at {DB_FILE}. Running setup scripts...")
         try:
-            import subprocess
-            venv_python_candidates = [
-                os.path.join(PROJECT_ROOT, "venv", "bin", "python"),
-                os.path.join(PROJECT_ROOT, "venv", "bin", "python3"),
-                sys.executable 
-            ]
-            venv_python = next((p for p in venv_python_candidates if os.path.exists(p)), sys.executable)
-            
-            print(f"Using Python interpreter: {venv_python} for setup.")
-            subprocess.run([venv_python, os.path.join(PROJECT_ROOT, "scripts", "database_setup.py")], check=True, cwd=PROJECT_ROOT)
             # Seeding is not strictly necessary for employee module tests if we clear the table,
             # but running it ensures all tables (like WorkSchedules) are present.
-            subprocess.run([venv_python, os.path.join(PROJECT_ROOT, "scripts", "seed_data.py")], check=True, cwd=PROJECT_ROOT)
+            run_setup_scripts("database_setup", "seed_data")
             print("Database setup and seeding scripts executed.")
         except Exception as e:
             print(f"Error running setup/seed scripts: {e}. Please ensure they are runnable.")
@@ -54,19 +38,14 @@ def setup_database():
     
     # Add a dummy WorkSchedule if none exists, as employee_service doesn't create them
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM WorkSchedules WHERE schedule_name = 'Default Test Schedule'")
-        if not cursor.fetchone():
-            cursor.execute("INSERT INTO WorkSchedules (schedule_name, expected_start_time, expected_end_time, grace_period_minutes) VALUES (?, ?, ?, ?)",
-                           ('Default Test Schedule', '09:00', '17:00', 15))
-            conn.commit()
-            print("Added 'Default Test Schedule' to WorkSchedules.")
+        conn = get_conn()
+        with conn: # Commits on success, rolls back on error
+            if not conn.execute("SELECT id FROM WorkSchedules WHERE schedule_name = 'Default Test Schedule'").fetchone():
+                conn.execute("INSERT INTO WorkSchedules (schedule_name, expected_start_time, expected_end_time, grace_period_minutes) VALUES (?, ?, ?, ?)",
+                             ('Default Test Schedule', '09:00', '17:00', 15))
+                print("Added 'Default Test Schedule' to WorkSchedules.")
     except sqlite3.Error as e:
         print(f"Error adding default work schedule: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 
 def main_test_flow():
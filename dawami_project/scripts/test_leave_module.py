@@ -1,21 +1,17 @@
-import os
 import sys
 import sqlite3
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta
 
-# Add project root to sys.path
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(PROJECT_ROOT)
+try:
+    from scripts._common import DB_FILE, get_conn, DB_EXISTS, run_setup_scripts # Also puts the project root on sys.path
+except ModuleNotFoundError: # Script run directly (python scripts/...), not with -m from the project root
+    from _common import DB_FILE, get_conn, DB_EXISTS, run_setup_scripts
 
 from dawami_app.backend.services import leave_service
 from dawami_app.backend.services import employee_service # To ensure test employees
 from dawami_app.backend.services import auth_service # To ensure test users (approvers)
 from dawami_app.frontend.views import leave_view # Placeholder UI handlers
 
-DB_DIR = os.path.join(PROJECT_ROOT, "dawami_app", "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
-
 # Test Employee and User (Approver) details
 TEST_EMP_ID = None
 TEST_EMP_CODE = "LEAVE_EMP01"
@@ -27,24 +23,28 @@ LT_ANNUAL_ID = None
 LT_SICK_ID = None
 LT_UNPAID_ID = None
 
+# All three DELETEs under one write lock and one commit
+_CLEAR_LEAVE_TABLES_SQL = """
+    BEGIN IMMEDIATE;
+    DELETE FROM LeaveRequests;
+    DELETE FROM LeaveBalances;
+    DELETE FROM LeaveTypes;
+    COMMIT;
+"""
+
 def clear_leave_related_tables():
     """Clears tables specific to leave module tests for a clean run."""
     print("\nClearing leave-related tables (LeaveRequests, LeaveBalances, LeaveTypes)...")
+    conn = get_conn()
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM LeaveRequests")
-        cursor.execute("DELETE FROM LeaveBalances")
         # Be cautious with LeaveTypes if they are meant to be more static.
         # For full test isolation, clearing them is okay.
-        cursor.execute("DELETE FROM LeaveTypes")
-        conn.commit()
+        conn.executescript(_CLEAR_LEAVE_TABLES_SQL)
         print("LeaveRequests, LeaveBalances, and LeaveTypes tables cleared.")
     except sqlite3.Error as e:
         print(f"Error clearing leave tables: {e}")
-    finally:
-        if conn:
-            conn.close()
+        if conn.in_transaction:
+            conn.rollback()
 
 def setup_test_entities():
     """Ensures test employees and users (approvers) exist."""
@@ -55,12 +55,10 @@ def setup_test_entities():
                                         f"{TEST_EMP_CODE.lower()}@example.com", "888-001", "Leave Tester")
     if emp:
         TEST_EMP_ID = emp['id']
-    else:
-        emps = employee_service.get_all_employees()
-        for e_item in emps:
-            if e_item['employee_code'] == TEST_EMP_CODE:
-                TEST_EMP_ID = e_item['id']
-                break
+    else: # Already exists; employee_code is UNIQUE, so this is an indexed lookup
+        existing = employee_service.get_employee_by_code(TEST_EMP_CODE)
+        if existing:
+            TEST_EMP_ID = existing['id']
     if not TEST_EMP_ID:
         print(f"CRITICAL: Could not create or find employee {TEST_EMP_CODE}")
         sys.exit(1)
@@ -72,13 +70,9 @@ def setup_test_entities():
     if approver:
         TEST_APPROVER_USER_ID = approver['id']
     else: # Try to fetch if user already exists
-        conn = auth_service.get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM Users WHERE username = ?", (TEST_APPROVER_USERNAME,))
-        user_row = cursor.fetchone()
+        user_row = get_conn().execute("SELECT id FROM Users WHERE username = ?", (TEST_APPROVER_USERNAME,)).fetchone()
         if user_row:
             TEST_APPROVER_USER_ID = user_row['id']
-        conn.close()
     
     if not TEST_APPROVER_USER_ID:
         print(f"CRITICAL: Could not create or find approver user {TEST_APPROVER_USERNAME}")
@@ -88,14 +82,10 @@ def setup_test_entities():
 
 def setup_database_and_base_data():
     """Ensures the DB, tables, and some base data (like roles via seed) exist."""
-    if not os.path.exists(DB_FILE):
+    if not DB_EXISTS:
         print(f"Database not found at {DB_FILE}. Running setup scripts...")
         try:
-            import subprocess
-            venv_python = next((p for p in [os.path.join(PROJECT_ROOT, "venv", "bin", "python"), sys.executable] if os.path.exists(p)), sys.executable)
-            print(f"Using Python interpreter: {venv_python} for setup.")
-            subprocess.run([venv_python, os.path.join(PROJECT_ROOT, "scripts", "database_setup.py")], check=True, cwd=PROJECT_ROOT)
-            subprocess.run([venv_python, os.path.join(PROJECT_ROOT, "scripts", "seed_data.py")], check=True, cwd=PROJECT_ROOT)
+            run_setup_scripts("database_setup", "seed_data")
             print("Database setup and seeding scripts executed.")
         except Exception as e:
             print(f"Error running setup/seed scripts: {e}.")
@@ -108,10 +98,8 @@ def setup_database_and_base_data():
 
 def calculate_leave_duration(start_date_str, end_date_str):
     """Calculates duration of leave in days, inclusive."""
-    try:
-        start_date = datetime.strptime(start_date_str, leave_service.DATE_FORMAT).date()
-        end_date = datetime.strptime(end_date_str, leave_service.DATE_FORMAT).date()
-        return (end_date - start_date).days + 1
+    try: # leave_service.DATE_FORMAT is ISO (YYYY-MM-DD), which date.fromisoformat parses directly
+        return (date.fromisoformat(end_date_str) - date.fromisoformat(start_date_str)).days + 1
     except ValueError:
         return 0
 
@@ -121,7 +109,12 @@ def main_test_flow():
     setup_database_and_base_data()
     clear_leave_related_tables() # Clean specific tables for these tests
 
-    current_year = datetime.now().year
+    today = date.today()
+    current_year = today.year
+    # Request dates are built with date.isoformat(), which matches the service's ISO DATE_FORMAT
+    assert leave_service.DATE_FORMAT == "%Y-%m-%d"
+    def iso_in_days(days):
+        return (today + timedelta(days=days)).isoformat()
     global LT_ANNUAL_ID, LT_SICK_ID, LT_UNPAID_ID
 
     # --- Test leave_service.py directly ---
@@ -129,12 +122,13 @@ def main_test_flow():
 
     # 1. Add Leave Types
     print("\n1. Adding Leave Types (Service):")
-    LT_ANNUAL_ID = leave_service.add_leave_type("Annual Test Leave", 20)
-    assert LT_ANNUAL_ID is not None
-    LT_SICK_ID = leave_service.add_leave_type("Sick Test Leave", 10)
-    assert LT_SICK_ID is not None
-    LT_UNPAID_ID = leave_service.add_leave_type("Unpaid Test Leave") # No default balance
-    assert LT_UNPAID_ID is not None
+    leave_type_ids = leave_service.add_leave_types_bulk([
+        ("Annual Test Leave", 20),
+        ("Sick Test Leave", 10),
+        ("Unpaid Test Leave", None), # No default balance
+    ])
+    assert leave_type_ids is not None and None not in leave_type_ids
+    LT_ANNUAL_ID, LT_SICK_ID, LT_UNPAID_ID = leave_type_ids
     
     leave_types_service = leave_service.get_leave_types()
     assert len(leave_types_service) >= 3 # Could be more if DB wasn't perfectly clean before
@@ -142,34 +136,29 @@ def main_test_flow():
 
     # 2. Set Initial Leave Balances
     print("\n2. Setting Initial Leave Balances (Service):")
-    bal_annual_set = leave_service.update_leave_balance(TEST_EMP_ID, LT_ANNUAL_ID, current_year, 20, is_initial_balance=True)
-    assert bal_annual_set == 20.0
-    bal_sick_set = leave_service.update_leave_balance(TEST_EMP_ID, LT_SICK_ID, current_year, 10, is_initial_balance=True)
-    assert bal_sick_set == 10.0
-    bal_unpaid_set = leave_service.update_leave_balance(TEST_EMP_ID, LT_UNPAID_ID, current_year, 0, is_initial_balance=True)
-    assert bal_unpaid_set == 0.0
+    assert leave_service.update_leave_balances_bulk([
+        (TEST_EMP_ID, LT_ANNUAL_ID, current_year, 20),
+        (TEST_EMP_ID, LT_SICK_ID, current_year, 10),
+        (TEST_EMP_ID, LT_UNPAID_ID, current_year, 0),
+    ]) is True
 
     # 3. Get Balances to verify
     assert leave_service.get_leave_balance(TEST_EMP_ID, LT_ANNUAL_ID, current_year) == 20.0
     assert leave_service.get_leave_balance(TEST_EMP_ID, LT_SICK_ID, current_year) == 10.0
+    assert leave_service.get_leave_balance(TEST_EMP_ID, LT_UNPAID_ID, current_year) == 0.0
     print("Initial balances verified.")
 
     # 4. Apply for Leave
     print("\n3. Applying for Leave (Service):")
-    req1_start_str = (date.today() + timedelta(days=30)).strftime(leave_service.DATE_FORMAT)
-    req1_end_str = (date.today() + timedelta(days=34)).strftime(leave_service.DATE_FORMAT) # 5 days
-    req1_id = leave_service.apply_for_leave(TEST_EMP_ID, LT_ANNUAL_ID, req1_start_str, req1_end_str, "Annual holiday")
-    assert req1_id is not None
-
-    req2_start_str = (date.today() + timedelta(days=60)).strftime(leave_service.DATE_FORMAT)
-    req2_end_str = (date.today() + timedelta(days=61)).strftime(leave_service.DATE_FORMAT) # 2 days
-    req2_id = leave_service.apply_for_leave(TEST_EMP_ID, LT_SICK_ID, req2_start_str, req2_end_str, "Medical checkup")
-    assert req2_id is not None
-    
-    req3_start_str = (date.today() + timedelta(days=90)).strftime(leave_service.DATE_FORMAT)
-    req3_end_str = (date.today() + timedelta(days=90)).strftime(leave_service.DATE_FORMAT) # 1 day
-    req3_id = leave_service.apply_for_leave(TEST_EMP_ID, LT_UNPAID_ID, req3_start_str, req3_end_str, "Personal day")
-    assert req3_id is not None
+    req1_start_str = iso_in_days(30)
+    req1_end_str = iso_in_days(34) # 5 days
+    request_ids = leave_service.apply_for_leaves_bulk([
+        (TEST_EMP_ID, LT_ANNUAL_ID, req1_start_str, req1_end_str, "Annual holiday"),
+        (TEST_EMP_ID, LT_SICK_ID, iso_in_days(60), iso_in_days(61), "Medical checkup"), # 2 days
+        (TEST_EMP_ID, LT_UNPAID_ID, iso_in_days(90), iso_in_days(90), "Personal day"), # 1 day
+    ])
+    assert request_ids is not None and len(request_ids) == 3
+    req1_id, req2_id, req3_id = request_ids
 
 
     # 5. Approve one request, Reject another
@@ -179,13 +168,10 @@ def main_test_flow():
     # req3 remains Pending
 
     # 6. Check Statuses
-    requests_after_action = leave_service.get_leave_requests(employee_id=TEST_EMP_ID)
-    found_req1, found_req2, found_req3 = False, False, False
-    for r in requests_after_action:
-        if r['id'] == req1_id: assert r['status'] == 'Approved'; found_req1 = True
-        if r['id'] == req2_id: assert r['status'] == 'Rejected'; found_req2 = True
-        if r['id'] == req3_id: assert r['status'] == 'Pending'; found_req3 = True
-    assert found_req1 and found_req2 and found_req3
+    status_by_id = leave_service.get_leave_statuses(TEST_EMP_ID)
+    assert status_by_id.get(req1_id) == 'Approved'
+    assert status_by_id.get(req2_id) == 'Rejected'
+    assert status_by_id.get(req3_id) == 'Pending' # req3 was left untouched
     print("Leave request statuses verified.")
 
     # 7. Simulate Leave Balance Deduction for Approved Leave
@@ -206,7 +192,10 @@ def main_test_flow():
 
     # --- Test placeholder UI functions from leave_view.py ---
     print("\n\n*** Testing placeholder UI functions from leave_view.py ***")
-    clear_leave_related_tables() # Clean again for UI handler tests
+    # Clean again for UI handler tests. This stays a real DELETE rather than a
+    # SAVEPOINT rolled back here: every leave_service call commits on the shared
+    # connection, and a COMMIT releases any enclosing savepoint.
+    clear_leave_related_tables()
     
     # Re-add leave types via UI handlers
     lt_annual_ui_id = leave_view.handle_add_leave_type_click("Annual UI Leave", 25)
@@ -219,8 +208,8 @@ def main_test_flow():
     leave_view.handle_view_leave_balance_click(TEST_EMP_ID, lt_annual_ui_id, current_year)
 
     # Apply for leave via UI
-    ui_req_start = (date.today() + timedelta(days=10)).strftime(leave_service.DATE_FORMAT)
-    ui_req_end = (date.today() + timedelta(days=12)).strftime(leave_service.DATE_FORMAT) # 3 days
+    ui_req_start = iso_in_days(10)
+    ui_req_end = iso_in_days(12) # 3 days
     ui_req_id = leave_view.handle_apply_leave_click(TEST_EMP_ID, lt_annual_ui_id, ui_req_start, ui_req_end, "UI Test Vacation")
     assert ui_req_id is not None
 
@@ -1,11 +1,20 @@
+import hashlib
+import inspect
+import json
 import os
 import sys
 import sqlite3
+import urllib.parse
 from datetime import datetime, date, timedelta
 
-# Add project root to sys.path
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(PROJECT_ROOT)
+# Run against a private in-memory database unless DAWAMI_DB_URL is already set (set it to an
+# empty string to use the on-disk dev DB). Must happen before _common or any service is imported.
+os.environ.setdefault("DAWAMI_DB_URL", "file:dawami_test_reporting?mode=memory&cache=shared")
+
+try:
+    from scripts._common import DB_FILE, get_conn, apply_test_pragmas, run_setup_scripts, get_db_url, DB_EXISTS # Also puts the project root on sys.path
+except ModuleNotFoundError: # Script run directly (python scripts/...), not with -m from the project root
+    from _common import DB_FILE, get_conn, apply_test_pragmas, run_setup_scripts, get_db_url, DB_EXISTS
 
 from dawami_app.backend.services import reporting_service
 from dawami_app.backend.services import employee_service
@@ -14,75 +23,90 @@ from dawami_app.backend.services import leave_service # Import the module
 from dawami_app.backend.services import auth_service # For creating approver user
 from dawami_app.frontend.views import reporting_view # Placeholder UI handlers
 
-DB_DIR = os.path.join(PROJECT_ROOT, "dawami_app", "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
-
 # Test entity IDs
 EMP_RPT_ID_1, EMP_RPT_ID_2, EMP_RPT_ID_3 = None, None, None
 EMP_RPT_CODE_1, EMP_RPT_CODE_2, EMP_RPT_CODE_3 = "RPTEMP001", "RPTEMP002", "RPTEMP003"
 APPROVER_RPT_ID = None
 LT_ANNUAL_RPT_ID, LT_SICK_RPT_ID = None, None
+_SEEDED_ID_NAMES = ("EMP_RPT_ID_1", "EMP_RPT_ID_2", "EMP_RPT_ID_3", "APPROVER_RPT_ID", "LT_ANNUAL_RPT_ID", "LT_SICK_RPT_ID")
+
+_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 def clear_test_data():
     """Clears data specific to this test module for a cleaner run."""
     print("\nClearing reporting module specific test data...")
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    codes = (EMP_RPT_CODE_1, EMP_RPT_CODE_2, EMP_RPT_CODE_3)
+    emp_ids_subquery = "SELECT id FROM Employees WHERE employee_code IN (?, ?, ?)"
+    conn = get_conn()
     try:
-        # Delete specific employees if they exist by code
-        for code in [EMP_RPT_CODE_1, EMP_RPT_CODE_2, EMP_RPT_CODE_3]:
-            cursor.execute("SELECT id FROM Employees WHERE employee_code = ?", (code,))
-            emp_row = cursor.fetchone()
-            if emp_row:
-                emp_id_to_delete = emp_row[0]
-                cursor.execute("DELETE FROM AttendanceLog WHERE employee_id = ?", (emp_id_to_delete,))
-                cursor.execute("DELETE FROM LeaveRequests WHERE employee_id = ?", (emp_id_to_delete,))
-                cursor.execute("DELETE FROM LeaveBalances WHERE employee_id = ?", (emp_id_to_delete,))
-                cursor.execute("DELETE FROM Users WHERE employee_id = ?", (emp_id_to_delete,)) # If users are linked
-                cursor.execute("DELETE FROM Employees WHERE id = ?", (emp_id_to_delete,))
-        
-        # Clear specific leave types by name if they exist
-        for lt_name in ["Annual Report Test", "Sick Report Test"]:
-            cursor.execute("DELETE FROM LeaveTypes WHERE type_name = ?", (lt_name,))
-        
-        # Clear specific users if they exist
-        cursor.execute("DELETE FROM Users WHERE username = 'rpt_approver'")
-        conn.commit()
+        with conn: # One transaction for the whole cleanup; rolls back on error
+            # Delete specific employees (and rows that reference them) by code
+            for table in ("AttendanceLog", "LeaveRequests", "LeaveBalances", "Users"): # Users: if linked
+                conn.execute(f"DELETE FROM {table} WHERE employee_id IN ({emp_ids_subquery})", codes)
+            conn.execute("DELETE FROM Employees WHERE employee_code IN (?, ?, ?)", codes)
+
+            # Clear specific leave types by name if they exist
+            conn.execute("DELETE FROM LeaveTypes WHERE type_name IN (?, ?)", ("Annual Report Test", "Sick Report Test"))
+
+            # Clear specific users if they exist
+            conn.execute("DELETE FROM Users WHERE username = 'rpt_approver'")
         print("Specific test data cleared (employees, related logs, specific leave types, specific user).")
     except sqlite3.Error as e:
         print(f"Error clearing test data: {e}")
-    finally:
-        conn.close()
+
+_INSERT_ATTENDANCE_SQL = """
+    INSERT INTO AttendanceLog (employee_id, clock_in_time, clock_out_time, attendance_date, notes, source)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+def _insert_attendance_rows(rows):
+    """Inserts ready-made AttendanceLog rows (clock_out_time may be None) in one transaction."""
+    conn = get_conn()
+    with conn:
+        conn.executemany(_INSERT_ATTENDANCE_SQL, rows)
 
 def setup_database_and_base_data():
-    """Ensures the DB, tables, and some base data (like roles via seed) exist."""
-    if not os.path.exists(DB_FILE):
+    """
+    Ensures the DB, tables, and some base data (like roles via seed) exist.
+    :return: True if the database was just created (so it holds no test data yet), False otherwise.
+    """
+    db_was_just_created = False
+    if not DB_EXISTS:
         print(f"Database not found at {DB_FILE}. Running setup scripts...")
         try:
-            import subprocess
-            venv_python = next((p for p in [os.path.join(PROJECT_ROOT, "venv", "bin", "python"), sys.executable] if os.path.exists(p)), sys.executable)
-            print(f"Using Python interpreter: {venv_python} for setup.")
-            subprocess.run([venv_python, os.path.join(PROJECT_ROOT, "scripts", "database_setup.py")], check=True, cwd=PROJECT_ROOT)
-            subprocess.run([venv_python, os.path.join(PROJECT_ROOT, "scripts", "seed_data.py")], check=True, cwd=PROJECT_ROOT)
+            run_setup_scripts("database_setup", "seed_data")
+            db_was_just_created = True
             print("Database setup and seeding scripts executed.")
         except Exception as e:
             print(f"Error running setup/seed scripts: {e}.")
             sys.exit(1)
     else:
         print(f"Database file found at {DB_FILE}.")
+    apply_test_pragmas()
+    return db_was_just_created
 
 def seed_specific_data_for_reports():
     global EMP_RPT_ID_1, EMP_RPT_ID_2, EMP_RPT_ID_3, APPROVER_RPT_ID, LT_ANNUAL_RPT_ID, LT_SICK_RPT_ID
     print("\nSeeding specific data for reporting tests...")
 
+    # Every date the seed data needs, formatted once
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    midnight_today = datetime.combine(today, datetime.min.time())
+    midnight_yday = datetime.combine(yesterday, datetime.min.time())
+    today_s = today.strftime(leave_service.DATE_FORMAT)
+    yesterday_s = yesterday.strftime(leave_service.DATE_FORMAT)
+    tomorrow_s = (today + timedelta(days=1)).strftime(leave_service.DATE_FORMAT)
+    day_after_s = (today + timedelta(days=2)).strftime(leave_service.DATE_FORMAT)
+
     # Employees
     emp1 = employee_service.add_employee("ReportEmp", "One", EMP_RPT_CODE_1, "ReportsDept", "rpt001@example.com", "999-001", "Analyst")
-    EMP_RPT_ID_1 = emp1['id'] if emp1 else employee_service.get_all_employees()[-1]['id'] # Fallback, assumes last added if exists
+    EMP_RPT_ID_1 = emp1['id'] if emp1 else employee_service.get_employee_by_code(EMP_RPT_CODE_1)['id'] # Fallback if it already exists
     emp2 = employee_service.add_employee("ReportEmp", "Two", EMP_RPT_CODE_2, "ReportsDept", "rpt002@example.com", "999-002", "Specialist")
-    EMP_RPT_ID_2 = emp2['id'] if emp2 else employee_service.get_all_employees()[-2]['id']
+    EMP_RPT_ID_2 = emp2['id'] if emp2 else employee_service.get_employee_by_code(EMP_RPT_CODE_2)['id']
     emp3 = employee_service.add_employee("ReportEmp", "Three", EMP_RPT_CODE_3, "Finance", "rpt003@example.com", "999-003", "Accountant")
-    EMP_RPT_ID_3 = emp3['id'] if emp3 else employee_service.get_all_employees()[-3]['id']
+    EMP_RPT_ID_3 = emp3['id'] if emp3 else employee_service.get_employee_by_code(EMP_RPT_CODE_3)['id']
     print(f"Test Employees: E1_ID={EMP_RPT_ID_1}, E2_ID={EMP_RPT_ID_2}, E3_ID={EMP_RPT_ID_3}")
 
     # Approver User (Manager)
@@ -91,65 +115,138 @@ def seed_specific_data_for_reports():
     print(f"Test Approver: UserID={APPROVER_RPT_ID}")
 
     # Leave Types
-    LT_ANNUAL_RPT_ID = leave_service.add_leave_type("Annual Report Test", 20)
-    LT_SICK_RPT_ID = leave_service.add_leave_type("Sick Report Test", 10)
+    LT_ANNUAL_RPT_ID, LT_SICK_RPT_ID = leave_service.add_leave_types_bulk([("Annual Report Test", 20), ("Sick Report Test", 10)])
     print(f"Test Leave Types: AnnualID={LT_ANNUAL_RPT_ID}, SickID={LT_SICK_RPT_ID}")
 
 
-    # Attendance Data
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-    
-    # Emp1: Present today, worked full day
-    att_serv_cin1_dt = datetime.combine(today, datetime.min.time()) + timedelta(hours=9) # Today 9 AM
-    att_serv_cout1_dt = datetime.combine(today, datetime.min.time()) + timedelta(hours=17, minutes=30) # Today 5:30 PM
-    attendance_service.clock_in(EMP_RPT_ID_1, clock_in_time_dt=att_serv_cin1_dt, source="test_setup")
-    attendance_service.clock_out(EMP_RPT_ID_1, clock_out_time_dt=att_serv_cout1_dt, notes="Full day")
-
-    # Emp2: Present today, still clocked IN
-    att_serv_cin2_dt = datetime.combine(today, datetime.min.time()) + timedelta(hours=10) # Today 10 AM
-    attendance_service.clock_in(EMP_RPT_ID_2, clock_in_time_dt=att_serv_cin2_dt, source="test_setup", notes="Late start")
-
-    # Emp1: Present yesterday also
-    att_serv_cin3_dt = datetime.combine(yesterday, datetime.min.time()) + timedelta(hours=8, minutes=45)
-    att_serv_cout3_dt = datetime.combine(yesterday, datetime.min.time()) + timedelta(hours=17, minutes=15)
-    attendance_service.clock_in(EMP_RPT_ID_1, clock_in_time_dt=att_serv_cin3_dt, source="test_setup")
-    attendance_service.clock_out(EMP_RPT_ID_1, clock_out_time_dt=att_serv_cout3_dt, notes="Yesterday's work")
+    # Attendance Data: historical rows with both timestamps known, so write them
+    # directly instead of replaying clock_in/clock_out (one commit instead of five)
+    fmt = attendance_service.DATETIME_FORMAT
+    _insert_attendance_rows([
+        # Emp1: Present today, worked full day (9 AM - 5:30 PM)
+        (EMP_RPT_ID_1, (midnight_today + timedelta(hours=9)).strftime(fmt),
+         (midnight_today + timedelta(hours=17, minutes=30)).strftime(fmt), today_s, "Clock-out: Full day", "test_setup"),
+        # Emp2: Present today, still clocked IN (10 AM)
+        (EMP_RPT_ID_2, (midnight_today + timedelta(hours=10)).strftime(fmt), None, today_s, "Late start", "test_setup"),
+        # Emp1: Present yesterday also
+        (EMP_RPT_ID_1, (midnight_yday + timedelta(hours=8, minutes=45)).strftime(fmt),
+         (midnight_yday + timedelta(hours=17, minutes=15)).strftime(fmt), yesterday_s, "Clock-out: Yesterday's work", "test_setup"),
+    ])
     print("Seeded attendance data.")
 
-    # Leave Data
-    # Emp2: Approved annual leave that includes today
-    leave_service.apply_for_leave(EMP_RPT_ID_2, LT_ANNUAL_RPT_ID, 
-                                  (today - timedelta(days=1)).strftime(leave_service.DATE_FORMAT), 
-                                  (today + timedelta(days=1)).strftime(leave_service.DATE_FORMAT), "Pre-approved annual")
-    lr_emp2 = leave_service.get_leave_requests(employee_id=EMP_RPT_ID_2, status='Pending')[0]
-    leave_service.approve_leave_request(lr_emp2['id'], APPROVER_RPT_ID)
-    
-    # Emp3: Pending sick leave for today
-    leave_service.apply_for_leave(EMP_RPT_ID_3, LT_SICK_RPT_ID,
-                                  today.strftime(leave_service.DATE_FORMAT),
-                                  (today + timedelta(days=2)).strftime(leave_service.DATE_FORMAT), "Sudden illness")
+    # Leave Data (both requests in one insert)
+    lr_emp2_id, _ = leave_service.apply_for_leaves_bulk([
+        # Emp2: Approved annual leave that includes today
+        (EMP_RPT_ID_2, LT_ANNUAL_RPT_ID, yesterday_s, tomorrow_s, "Pre-approved annual"),
+        # Emp3: Pending sick leave for today
+        (EMP_RPT_ID_3, LT_SICK_RPT_ID, today_s, day_after_s, "Sudden illness"),
+    ])
+    leave_service.approve_leave_request(lr_emp2_id, APPROVER_RPT_ID)
     print("Seeded leave data.")
     print("Test data seeding complete.")
 
 
+def golden_snapshot_paths():
+    """
+    Snapshot and stamp file paths for the database this run uses, or None if snapshots don't apply.
+    A snapshot of the DB right after seeding is only kept for a dedicated on-disk test database
+    (DAWAMI_DB_URL naming a file other than dawami_dev.db): restoring it replaces the whole database,
+    which would wipe anything the dev DB holds besides this test's rows. In-memory databases are
+    seeded in RAM anyway, so a disk round-trip wouldn't save anything there.
+    """
+    db_url = get_db_url()
+    if not db_url or "mode=memory" in db_url or ":memory:" in db_url:
+        return None
+    db_path = urllib.parse.unquote(urllib.parse.urlparse(db_url).path)
+    if not db_path or os.path.abspath(db_path) == os.path.abspath(DB_FILE):
+        return None
+    golden_file = db_path + ".golden"
+    return golden_file, golden_file + ".json"
+
+def golden_snapshot_fingerprint():
+    """Hash of everything that shapes the seeded data; a snapshot taken before any of it changed is stale."""
+    digest = hashlib.sha1()
+    for script in ("database_setup.py", "seed_data.py"):
+        with open(os.path.join(_SCRIPTS_DIR, script), "rb") as f:
+            digest.update(f.read())
+    digest.update(inspect.getsource(seed_specific_data_for_reports).encode("utf-8"))
+    digest.update(repr(_SEEDED_ID_NAMES).encode("utf-8"))
+    return digest.hexdigest()
+
+def save_golden_snapshot():
+    """Copies the freshly seeded test database aside and records the database, date, seed fingerprint and seeded IDs."""
+    paths = golden_snapshot_paths()
+    if paths is None:
+        return
+    golden_file, stamp_file = paths
+    try:
+        golden = sqlite3.connect(golden_file)
+        try:
+            get_conn().backup(golden) # Consistent copy, including pages still in the WAL
+        finally:
+            golden.close()
+        with open(stamp_file, "w", encoding="utf-8") as f:
+            json.dump({"db": get_db_url(), "date": date.today().isoformat(), "fingerprint": golden_snapshot_fingerprint(),
+                       "ids": {name: globals()[name] for name in _SEEDED_ID_NAMES}}, f)
+        print(f"Saved seeded database snapshot to {golden_file}.")
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warning: could not save database snapshot: {e}")
+
+def restore_golden_snapshot():
+    """
+    Copies today's snapshot (if any) back over the test database and reloads the seeded IDs.
+    :return: True if the snapshot was restored, False if clear + seed must run instead.
+    """
+    paths = golden_snapshot_paths()
+    if paths is None:
+        return False
+    golden_file, stamp_file = paths
+    try:
+        with open(stamp_file, encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if stamp.get("db") != get_db_url():
+        return False # Snapshot of a different database
+    if stamp.get("date") != date.today().isoformat() or stamp.get("fingerprint") != golden_snapshot_fingerprint():
+        return False # Stale: seeded on another day, or the schema/seed code has changed since
+    if not os.path.exists(golden_file):
+        return False
+    try:
+        golden = sqlite3.connect(golden_file)
+        try:
+            golden.backup(get_conn()) # Written through the shared connection, which stays usable
+        finally:
+            golden.close()
+    except sqlite3.Error as e:
+        print(f"Warning: could not restore database snapshot: {e}")
+        return False
+    globals().update(stamp["ids"])
+    print(f"Restored seeded database snapshot from {golden_file} (seeded {stamp['date']}).")
+    return True
+
 def main_test_flow():
     print("--- Starting Reporting Module Test ---")
-    setup_database_and_base_data() # Ensures DB, tables, base roles/users
-    clear_test_data() # Clear data from previous specific test runs of this module
-    seed_specific_data_for_reports() # Add fresh data for this test run
+    db_was_just_created = setup_database_and_base_data() # Ensures DB, tables, base roles/users
+    if not restore_golden_snapshot(): # Reuse today's seeded snapshot of a dedicated test DB, if any
+        if not db_was_just_created: # A fresh DB has nothing from previous runs to clear
+            clear_test_data() # Clear data from previous specific test runs of this module
+        seed_specific_data_for_reports() # Add fresh data for this test run
+        save_golden_snapshot()
 
     today = date.today()
     yesterday = today - timedelta(days=1)
     next_week_start = today + timedelta(days=7-today.weekday())
     next_week_end = next_week_start + timedelta(days=6)
+    today_s = today.strftime(reporting_service.DATE_FORMAT)
+    yesterday_s = yesterday.strftime(reporting_service.DATE_FORMAT)
 
 
     # --- Test reporting_service.py directly ---
     print("\n\n*** Testing reporting_service.py directly ***")
 
     # 1. Daily Attendance Report
-    print(f"\n1. Daily Attendance Report for {today.strftime(reporting_service.DATE_FORMAT)} (Service):")
+    print(f"\n1. Daily Attendance Report for {today_s} (Service):")
     daily_att_report = reporting_service.get_daily_attendance_report(today)
     assert len(daily_att_report) >= 2 # Emp1 (clocked out) and Emp2 (clocked in)
     print(f"  Found {len(daily_att_report)} records.")
@@ -174,7 +271,7 @@ def main_test_flow():
     print(f"  Found {len(leave_report_approved_emp2)} approved leave for {EMP_RPT_CODE_2} in range.")
 
     # 4. Absentee Report (Optional - Basic)
-    print(f"\n4. Absentee Report for {today.strftime(reporting_service.DATE_FORMAT)} (Service):")
+    print(f"\n4. Absentee Report for {today_s} (Service):")
     # Expected: EMP_RPT_3 is absent (has pending leave, not approved)
     # EMP_RPT_1 has attendance. EMP_RPT_2 has attendance (still clocked in) AND approved leave.
     # The current absentee logic will count EMP_RPT_2 as NOT absent because of attendance.
@@ -193,20 +290,20 @@ def main_test_flow():
     print("\n\n*** Testing placeholder UI functions from reporting_view.py ***")
 
     # 1. Daily Attendance Report via UI Handler
-    reporting_view.handle_generate_daily_attendance_report_click(today.strftime(reporting_service.DATE_FORMAT))
+    reporting_view.handle_generate_daily_attendance_report_click(today_s)
 
     # 2. Employee Summary via UI Handler
-    reporting_view.handle_generate_employee_summary_click(EMP_RPT_ID_1, yesterday.strftime(reporting_service.DATE_FORMAT), today.strftime(reporting_service.DATE_FORMAT))
+    reporting_view.handle_generate_employee_summary_click(EMP_RPT_ID_1, yesterday_s, today_s)
 
     # 3. Leave Report via UI Handler
     reporting_view.handle_generate_leave_report_click(
-        start_date_str=yesterday.strftime(reporting_service.DATE_FORMAT),
+        start_date_str=yesterday_s,
         end_date_str=next_week_end.strftime(reporting_service.DATE_FORMAT),
         status='Pending' 
     )
     
     # 4. Absentee Report via UI Handler
-    reporting_view.handle_generate_absentee_report_click(today.strftime(reporting_service.DATE_FORMAT))
+    reporting_view.handle_generate_absentee_report_click(today_s)
 
     print("\n*** Placeholder UI function tests completed. ***")
     print("\n--- Reporting Module Test Completed Successfully ---")
@@ -1,75 +1,80 @@
+import functools
 import os
 import sys
 import sqlite3
 from datetime import datetime, date, timedelta
 
-# Add project root to sys.path
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.append(PROJECT_ROOT)
+# Run against a private in-memory database unless DAWAMI_DB_URL is already set (set it to an
+# empty string to use the on-disk dev DB). Must happen before _common or any service is imported.
+os.environ.setdefault("DAWAMI_DB_URL", "file:dawami_test_settings?mode=memory&cache=shared")
+
+try:
+    from scripts._common import get_conn, apply_test_pragmas, run_setup_scripts, DB_EXISTS # Also puts the project root on sys.path
+except ModuleNotFoundError: # Script run directly (python scripts/...), not with -m from the project root
+    from _common import get_conn, apply_test_pragmas, run_setup_scripts, DB_EXISTS
 
 from dawami_app.backend.services import settings_service
 from dawami_app.frontend.views import settings_view # Placeholder UI handlers
 
-DB_DIR = os.path.join(PROJECT_ROOT, "dawami_app", "database")
-DB_NAME = "dawami_dev.db"
-DB_FILE = os.path.join(DB_DIR, DB_NAME)
+# All three DELETEs under one write lock and one commit.
+# Clearing WorkSchedules might affect Employees if ON DELETE CASCADE was used (it's SET NULL).
+_CLEAR_SETTINGS_TABLES_SQL = """
+    BEGIN IMMEDIATE;
+    DELETE FROM SystemSettings;
+    DELETE FROM WorkSchedules;
+    DELETE FROM Holidays;
+    COMMIT;
+"""
 
 def clear_settings_tables():
     """Clears tables specific to settings module tests for a clean run."""
     print("\nClearing settings-related tables (SystemSettings, WorkSchedules, Holidays)...")
+    conn = get_conn()
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM SystemSettings")
-        cursor.execute("DELETE FROM WorkSchedules") # Note: This might affect Employees if ON DELETE CASCADE was used (it's SET NULL)
-        cursor.execute("DELETE FROM Holidays")
-        conn.commit()
+        conn.executescript(_CLEAR_SETTINGS_TABLES_SQL)
         print("SystemSettings, WorkSchedules, and Holidays tables cleared.")
     except sqlite3.Error as e:
         print(f"Error clearing settings tables: {e}")
-    finally:
-        if conn:
-            conn.close()
+        if conn.in_transaction:
+            conn.rollback()
+
+@functools.lru_cache(maxsize=1)
+def _holidays_table_exists():
+    """Checks sqlite_master for the Holidays table; the answer is cached for the rest of the run."""
+    try:
+        return get_conn().execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='Holidays'").fetchone() is not None
+    except sqlite3.DatabaseError as e: # e.g. the file exists but isn't a database
+        print(f"Database check failed ('{e}').")
+        return False
 
 def run_database_setup_if_needed():
-    """Ensures the database and all tables, including Holidays, exist."""
+    """
+    Ensures the database and all tables, including Holidays, exist.
+    :return: True if the database file was just created (so the settings tables are empty), False otherwise.
+    """
+    db_was_just_created = False
     # We need to ensure database_setup.py (which now includes Holidays table) is run.
     # A simple check for one of the later tables (like Holidays) can tell us if it likely ran.
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='Holidays';")
-        if cursor.fetchone() is None: # Holidays table doesn't exist
-            raise sqlite3.DatabaseError("Holidays table not found, running setup.")
+    if _holidays_table_exists():
         print("Database and Holidays table appear to be set up.")
-        
-    except (sqlite3.DatabaseError, sqlite3.OperationalError) as e: # Catch if DB itself or table is missing
-        print(f"Database check failed ('{e}'). Running/Re-running database_setup.py...")
+    else:
+        print("Holidays table not found. Running/Re-running database_setup.py...")
         try:
-            import subprocess
-            setup_script_path = os.path.join(PROJECT_ROOT, "scripts", "database_setup.py")
-            # Use sys.executable to ensure it's the python from the correct env (ideally venv)
-            venv_python = sys.executable 
-            if "venv" not in venv_python : # A heuristic, might need adjustment
-                 venv_python_candidate = os.path.join(PROJECT_ROOT, "venv", "bin", "python")
-                 if os.path.exists(venv_python_candidate):
-                     venv_python = venv_python_candidate
-
-            print(f"Using Python interpreter: {venv_python} for database_setup.py.")
-            subprocess.run([venv_python, setup_script_path], check=True, cwd=PROJECT_ROOT)
+            run_setup_scripts("database_setup")
+            _holidays_table_exists.cache_clear() # Setup just created it
+            db_was_just_created = not DB_EXISTS # An older DB that only lacked Holidays may still hold settings
             print("database_setup.py executed successfully.")
         except Exception as proc_e:
             print(f"Error running database_setup.py: {proc_e}. Please run it manually.")
             sys.exit(1)
-    finally:
-        if conn:
-            conn.close()
+    apply_test_pragmas()
+    return db_was_just_created
 
 def main_test_flow():
     print("--- Starting Settings Module Test ---")
-    run_database_setup_if_needed() # Ensure Holidays table is created
-    clear_settings_tables()
+    db_was_just_created = run_database_setup_if_needed() # Ensure Holidays table is created
+    if not db_was_just_created: # Nothing to clear in a brand-new DB
+        clear_settings_tables()
 
     # --- Test settings_service.py for SystemSettings ---
     print("\n*** Testing SystemSettings (Service) ***")